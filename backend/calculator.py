@@ -1,79 +1,257 @@
-import random
-from typing import List, Dict, Any
+import os
+import numpy as np
+from typing import List, Dict, Any, Iterator, Optional
 from .models import LeagueData, Team, PlayoffOdds
+from .cache import LRUCache
+from .metrics import span, timed
+from .plan import LeagueInput, SimulationPlan, get_plan
+from .simulation import (
+    EXACT_MAX_GAMES,
+    expected_wins,
+    iter_simulate_league,
+    matching_rows,
+    pin_games,
+    simulate_league,
+    weighted_outcome_sums,
+    wilson_half_width,
+)
 
-def calculate_odds(league_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+# Simulations are adaptive: run in batches until every undecided team's 95%
+# confidence interval is narrower than TARGET_CI_WIDTH, capped by
+# SIMULATIONS runs and TIME_BUDGET seconds. Pass target_width=None for a
+# fixed count of exactly `simulations`.
+SIMULATIONS = 200000
+TARGET_CI_WIDTH = 0.02 # +/- 1 percentage point
+TIME_BUDGET = 2.0
+
+# Processes to shard sampling across; 1 keeps everything in-process
+WORKERS = int(os.environ.get("SIMULATION_WORKERS", "1"))
+
+# What-if queries condition the cached simulation on the locked games. A
+# sampled simulation with fewer matching rows than this is topped up to it
+# with rows drawn with the locks applied.
+MIN_CONDITIONED_ROWS = 2000
+
+def simulation_nbytes(simulation: Dict[str, Any]) -> int:
+    """
+    Approximate memory held by a simulation artifact.
+    """
+    arrays = list(simulation["arrays"].values()) + list(simulation.values())
+    return sum(a.nbytes for a in arrays if isinstance(a, np.ndarray))
+
+# One simulation artifact per league state, shared by /odds and /scenarios
+SIMULATION_CACHE = LRUCache(
+    max_bytes=256 * 1024 * 1024,
+    ttl=15 * 60,
+    max_entries=64,
+    sizeof=simulation_nbytes,
+)
+
+def iter_simulation(
+    league_data: LeagueInput,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generator form of run_simulation: yields a progress snapshot after each
+    adaptive batch and the finished artifact last (see
+    simulation.iter_simulate_league). Every item carries the plan, its
+    engine arrays and the max-flow decisions; the finished artifact also
+    carries the seed distribution.
+    """
+    plan = get_plan(league_data)
+    for sim in iter_simulate_league(
+        plan.arrays,
+        plan.playoff_spots,
+        simulations,
+        seed,
+        exact_max_games,
+        target_width=target_width,
+        time_budget=TIME_BUDGET,
+        workers=WORKERS,
+        positions=True,
+    ):
+        sim["plan"] = plan
+        sim["arrays"] = plan.arrays
+        sim["decided"] = plan.decided
+        yield sim
+
+def run_simulation(
+    league_data: LeagueInput,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Dict[str, Any]:
+    """
+    Runs one simulation of the league and returns the artifact that odds and
+    scenario analysis are read from: the engine arrays, the outcome matrix,
+    row weights, the final standings and the playoff mask.
+    """
+    for sim in iter_simulation(league_data, simulations, seed, exact_max_games, target_width):
+        pass
+    return sim
+
+def simulation_key(
+    league_data: LeagueInput,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> str:
+    return get_plan(league_data).settings_key(
+        simulations=simulations,
+        seed=seed,
+        exact_max_games=exact_max_games,
+        target_width=target_width,
+        workers=WORKERS,
+    )
+
+def get_simulation(
+    league_data: LeagueInput,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Dict[str, Any]:
+    """
+    Returns the cached simulation for this league state, running it on a miss.
+    """
+    key = simulation_key(league_data, simulations, seed, exact_max_games, target_width)
+    simulation = SIMULATION_CACHE.get(key)
+    if simulation is None:
+        simulation = run_simulation(league_data, simulations, seed, exact_max_games, target_width)
+        SIMULATION_CACHE.set(key, simulation)
+    return simulation
+
+def confidence_half_widths(sim: Dict[str, Any]) -> np.ndarray:
+    """
+    95% confidence half-width of each team's playoff probability.
+    Zero for exact results and for teams whose fate is decided.
+    """
+    num_teams = len(sim["arrays"]["team_ids"])
+    widths = np.zeros(num_teams)
+    if not sim["exact"]:
+        active = sim["arrays"]["active"]
+        successes = sim["made"][:, active].sum(axis=0)
+        widths[active] = wilson_half_width(successes, sim["simulations"])
+    return widths
+
+def calculate_odds(
+    league_data: Dict[str, Any],
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> List[Dict[str, Any]]:
     """
     Calculates playoff odds using Monte Carlo simulation.
+    Simulations are drawn in batches by the vectorized engine until the
+    odds reach `target_width` precision; pass `seed` for reproducible
+    results. Schedules with at most `exact_max_games` remaining games are
+    enumerated exactly instead. Each entry reports the number of
+    simulations run and its margin of error in percentage points, plus the
+    team's seed distribution, first- and last-place odds and expected
+    final wins.
+
+    Clinched and eliminated flags come from the deterministic max-flow
+    check, and those teams are pruned from the simulation. The simulation
+    itself is shared with analyze_team_scenarios through SIMULATION_CACHE.
     """
-    teams_data = league_data["teams"]
-    schedule = league_data["schedule"]
-    playoff_spots = league_data["playoff_spots"]
-    
-    # Convert to dictionary for easier access
-    teams_map = {t["id"]: t for t in teams_data}
-    
-    SIMULATIONS = 1000
-    results = {t["id"]: 0 for t in teams_data}
-    
-    for _ in range(SIMULATIONS):
-        # Deep copy teams to simulate this run
-        sim_teams = {
-            tid: {
-                "id": t["id"],
-                "wins": t["wins"],
-                "losses": t["losses"],
-                "ties": t["ties"],
-                "points_for": t["points_for"]
-            } for tid, t in teams_map.items()
-        }
-        
-        # Simulate remaining games
-        for game in schedule:
-            if not game.get("completed", False):
-                # Simple 50/50 coin flip for now
-                # Could be improved with power rankings based on PF
-                # Let's use Points For as a weight
-                t1 = teams_map.get(game["team1_id"])
-                t2 = teams_map.get(game["team2_id"])
-                
-                if t1 and t2:
-                    # Simple probability based on PF
-                    # Add a small epsilon to avoid division by zero
-                    total_pf = t1["points_for"] + t2["points_for"] + 1.0
-                    t1_prob = (t1["points_for"] + 0.5) / total_pf
-                    
-                    winner_id = game["team1_id"] if random.random() < t1_prob else game["team2_id"]
-                else:
-                    winner_id = game["team1_id"] if random.random() > 0.5 else game["team2_id"]
-
-                loser_id = game["team2_id"] if winner_id == game["team1_id"] else game["team1_id"]
-                
-                sim_teams[winner_id]["wins"] += 1
-                sim_teams[loser_id]["losses"] += 1
-        
-        # Rank teams
-        # Sort by Wins (desc), then Points For (desc)
-        sorted_teams = sorted(
-            sim_teams.values(),
-            key=lambda x: (x["wins"], x["points_for"]),
-            reverse=True
-        )
-        
-        # Count playoff appearances
-        for i in range(playoff_spots):
-            if i < len(sorted_teams):
-                results[sorted_teams[i]["id"]] += 1
-                
+    # A scrape that parsed no teams has nothing to simulate
+    if not league_data["teams"]:
+        return []
+    sim = get_simulation(league_data, simulations, seed, exact_max_games, target_width)
+    return odds_from_simulation(sim, league_data["teams"])
+
+def league_teams(league_data: LeagueInput) -> List[Dict[str, Any]]:
+    """
+    The league's teams as dicts, from the scraped dict or a LeagueData
+    model. Names are always read from here: the cached plan is shared by
+    every league state with the same records and schedule, renames
+    included.
+    """
+    if isinstance(league_data, LeagueData):
+        return [team.dict() for team in league_data.teams]
+    return league_data["teams"]
+
+@timed("analyze")
+def odds_from_simulation(sim: Dict[str, Any], teams: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Formats the odds table from a finished simulation artifact, with names
+    from `teams`. Seeding fields are included when the simulation recorded
+    standings (not for what-if simulations).
+    """
+    arrays = sim["arrays"]
+    decided = sim["decided"]
+    made = sim["made"]
+    probabilities = sim["weights"] @ made
+    clinched = np.array([decided.get(tid) is True for tid in arrays["team_ids"]])
+    eliminated = np.array([decided.get(tid) is False for tid in arrays["team_ids"]])
+    seeding = (sim["seeds"], expected_wins(arrays), sim["seed_half_width"]) if "seeds" in sim else ()
+    if sim["exact"]:
+        # Enumeration settles anything the max-flow check left open
+        clinched |= made.all(axis=0)
+        eliminated |= ~made.any(axis=0)
+    return format_odds(
+        teams, arrays["team_ids"], probabilities, clinched, eliminated,
+        confidence_half_widths(sim), sim["simulations"], *seeding,
+    )
+
+def odds_from_progress(progress: Dict[str, Any], teams: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Formats a provisional odds table from an adaptive progress snapshot
+    (running playoff counts), without merging the batches drawn so far.
+    """
+    arrays = progress["arrays"]
+    decided = progress["decided"]
+    n = progress["simulations"]
+    successes = progress["successes"]
+    active = arrays["active"]
+    clinched = np.array([decided.get(tid) is True for tid in arrays["team_ids"]])
+    eliminated = np.array([decided.get(tid) is False for tid in arrays["team_ids"]])
+    half_widths = np.zeros(len(arrays["team_ids"]))
+    half_widths[active] = wilson_half_width(successes[active], n)
+    return format_odds(
+        teams, arrays["team_ids"], successes / n, clinched, eliminated, half_widths, n,
+    )
+
+def format_odds(
+    teams_data: List[Dict[str, Any]],
+    team_ids: List[str],
+    probabilities: np.ndarray,
+    clinched: np.ndarray,
+    eliminated: np.ndarray,
+    half_widths: np.ndarray,
+    simulations: int,
+    seeds: Optional[np.ndarray] = None,
+    win_totals: Optional[np.ndarray] = None,
+    seed_half_width: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Builds the odds response entries, sorted by playoff probability.
+    `seeds` (teams x places probabilities) and `win_totals` (expected final
+    wins) add the seeding fields when given, with `seed_half_width` as the
+    seeds' margin of error.
+    """
+    results = {
+        tid: (float(probabilities[i]), bool(clinched[i]), bool(eliminated[i]), float(half_widths[i]))
+        for i, tid in enumerate(team_ids)
+    }
+    index = {tid: i for i, tid in enumerate(team_ids)}
+
     # Format results
     odds_results = []
     for team in teams_data:
-        prob = (results[team["id"]] / SIMULATIONS) * 100
-        
+        prob, is_clinched, is_eliminated, half_width = results[team["id"]]
+        prob *= 100
+
         scenarios = []
-        if prob == 100.0:
+        if is_clinched:
             scenarios.append("Clinched playoffs")
-        elif prob == 0.0:
+        elif is_eliminated:
             scenarios.append("Eliminated")
         elif prob >= 90.0:
             scenarios.append("Very likely to make it")
@@ -81,116 +259,333 @@ def calculate_odds(league_data: Dict[str, Any]) -> List[Dict[str, Any]]:
             scenarios.append("Needs a miracle")
         else:
             scenarios.append("In the hunt")
-            
+
         odds_results.append({
             "team_id": team["id"],
             "team_name": team["name"],
             "playoff_probability": round(prob, 1),
-            "clinched_playoffs": prob == 100.0,
-            "eliminated": prob == 0.0,
-            "scenarios": scenarios
+            "clinched_playoffs": is_clinched,
+            "eliminated": is_eliminated,
+            "scenarios": scenarios,
+            "simulations": simulations,
+            "margin_of_error": round(half_width * 100, 2)
         })
-        
+        i = index[team["id"]]
+        if seeds is not None:
+            odds_results[-1]["seed_probabilities"] = [round(float(p) * 100, 1) for p in seeds[i]]
+            odds_results[-1]["first_place_probability"] = round(float(seeds[i, 0]) * 100, 1)
+            odds_results[-1]["last_place_probability"] = round(float(seeds[i, -1]) * 100, 1)
+            odds_results[-1]["seed_margin_of_error"] = round(seed_half_width * 100, 2)
+        if win_totals is not None:
+            odds_results[-1]["expected_wins"] = round(float(win_totals[i]), 2)
+
     return sorted(odds_results, key=lambda x: x["playoff_probability"], reverse=True)
 
-def analyze_team_scenarios(league_data: LeagueData, focus_team_id: str) -> Dict[str, Any]:
+def iter_odds(
+    league_data: Dict[str, Any],
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Iterator[Dict[str, Any]]:
     """
-    Analyzes specific scenarios for a team to make the playoffs.
-    Returns a list of necessary and helpful conditions.
+    Progressive calculate_odds. Yields {"final", "simulations", "odds"}
+    after every simulation batch as the estimates converge; the last item
+    is final and matches calculate_odds. The finished simulation is stored
+    in SIMULATION_CACHE, and a cached one is returned in a single step.
     """
-    SIMULATIONS = 2000 # Higher count for better scenario accuracy
-    teams_data = league_data.teams
-    schedule = league_data.schedule
-    playoff_spots = league_data.playoff_spots
-    
-    teams_map = {t.id: t.dict() for t in teams_data}
-    
-    successful_sims = [] # List of (game_results, final_standings)
-    
-    for i in range(SIMULATIONS):
-        sim_teams = {t_id: t_data.copy() for t_id, t_data in teams_map.items()}
-        game_results = {} # Key: "week-team1-team2", Value: winner_id
-        
-        # Simulate remaining games
-        # Simulate remaining games
-        for game in schedule:
-            if not game.completed:
-                t1 = teams_map.get(game.team1_id)
-                t2 = teams_map.get(game.team2_id)
-                
-                winner_id = None
-                if t1 and t2:
-                    total_pf = t1["points_for"] + t2["points_for"] + 1.0
-                    t1_prob = (t1["points_for"] + 0.5) / total_pf
-                    winner_id = game.team1_id if random.random() < t1_prob else game.team2_id
-                else:
-                    winner_id = game.team1_id if random.random() > 0.5 else game.team2_id
-
-                loser_id = game.team2_id if winner_id == game.team1_id else game.team1_id
-                
-                sim_teams[winner_id]["wins"] += 1
-                sim_teams[loser_id]["losses"] += 1
-                
-                game_key = f"{game.week}-{game.team1_id}-{game.team2_id}"
-                game_results[game_key] = winner_id
-        
-        # Rank teams
-        sorted_teams = sorted(
-            sim_teams.values(),
-            key=lambda x: (x["wins"], x["points_for"]),
-            reverse=True
+    if not league_data["teams"]:
+        yield {"final": True, "simulations": 0, "odds": []}
+        return
+    key = simulation_key(league_data, simulations, seed, exact_max_games, target_width)
+    sim = SIMULATION_CACHE.get(key)
+    if sim is None:
+        for sim in iter_simulation(league_data, simulations, seed, exact_max_games, target_width):
+            if not sim["final"]:
+                yield {"final": False, "simulations": sim["simulations"], "odds": odds_from_progress(sim, league_data["teams"])}
+        SIMULATION_CACHE.set(key, sim)
+    yield {"final": True, "simulations": sim["simulations"], "odds": odds_from_simulation(sim, league_data["teams"])}
+
+def resolve_locks(league_data: Dict[str, Any], plan: SimulationPlan, locks: Dict[str, str]) -> Dict[int, bool]:
+    """
+    Maps what-if locks ({game_key: winning team id}) to outcome columns
+    ({column: team 1 won}). Raises ValueError for a game that isn't left on
+    the schedule or a winner who isn't playing in it. Games the plan left
+    out (between two decided teams) can't change anyone's odds and are
+    skipped.
+    """
+    remaining = {
+        f"{g['week']}-{g['team1_id']}-{g['team2_id']}": g
+        for g in league_data["schedule"]
+        if not g.get("completed", False)
+    }
+    locked = {}
+    for game_key, winner_id in locks.items():
+        game = remaining.get(game_key)
+        if game is None:
+            raise ValueError(f"Unknown or completed game: {game_key}")
+        if winner_id not in (game["team1_id"], game["team2_id"]):
+            raise ValueError(f"Team {winner_id} does not play in game {game_key}")
+        column = plan.game_index.get(game_key)
+        if column is not None:
+            locked[column] = winner_id == game["team1_id"]
+    return locked
+
+def whatif_simulation(
+    league_data: Dict[str, Any],
+    locks: Dict[str, str],
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Dict[str, Any]:
+    """
+    The league's simulation conditioned on the locked games.
+
+    Rows of the cached simulation that match every lock are kept and their
+    weights renormalized, which is exact for enumerated schedules. When a
+    sampled simulation has fewer than MIN_CONDITIONED_ROWS matching rows,
+    it is topped up to that many with rows drawn with the locked games
+    pinned (cached per set of locks): only the shortfall is simulated, so
+    the answer still comes mostly from the cached run. `method` records
+    which path answered and `conditioned_rows` how many cached rows it
+    kept.
+    """
+    plan = get_plan(league_data)
+    locked = resolve_locks(league_data, plan, locks)
+    sim = get_simulation(league_data, simulations, seed, exact_max_games, target_width)
+    if not locked:
+        return {**sim, "method": "unconditioned", "conditioned_rows": sim["simulations"]}
+
+    mask = matching_rows(sim["outcome_bits"], locked)
+    rows = int(mask.sum())
+    conditioned = {
+        "plan": plan,
+        "arrays": sim["arrays"],
+        "decided": sim["decided"],
+        "exact": sim["exact"],
+        "num_games": sim["num_games"],
+        "outcome_bits": sim["outcome_bits"][mask],
+        "made": sim["made"][mask],
+        "simulations": rows,
+        "conditioned_rows": rows,
+        "method": "conditioned",
+    }
+    if sim["exact"] or rows >= MIN_CONDITIONED_ROWS:
+        weights = sim["weights"][mask]
+        return {**conditioned, "weights": weights / weights.sum()}
+
+    key = plan.settings_key(
+        simulations=simulations,
+        seed=seed,
+        exact_max_games=exact_max_games,
+        target_width=target_width,
+        workers=WORKERS,
+        locks=sorted(locked.items()),
+    )
+    topped_up = SIMULATION_CACHE.get(key)
+    if topped_up is None:
+        extra = simulate_league(
+            pin_games(plan.arrays, locked),
+            plan.playoff_spots,
+            MIN_CONDITIONED_ROWS - rows,
+            # Offset so the top-up doesn't replay the cached run's draws
+            None if seed is None else seed + 1,
+            exact_max_games=0,
         )
-        
-        # Check if focus team made playoffs
-        made_playoffs = False
-        for i in range(playoff_spots):
-            if i < len(sorted_teams) and sorted_teams[i]["id"] == focus_team_id:
-                made_playoffs = True
-                break
-        
-        if made_playoffs:
-            successful_sims.append(game_results)
-            
-    # Analyze successful simulations
-    total_success = len(successful_sims)
+        topped_up = {
+            **conditioned,
+            "outcome_bits": np.concatenate([conditioned["outcome_bits"], extra["outcome_bits"]]),
+            "made": np.concatenate([conditioned["made"], extra["made"]]),
+            "weights": np.full(MIN_CONDITIONED_ROWS, 1.0 / MIN_CONDITIONED_ROWS),
+            "simulations": MIN_CONDITIONED_ROWS,
+            "method": "topped_up",
+        }
+        SIMULATION_CACHE.set(key, topped_up)
+    return topped_up
+
+def whatif_odds(
+    league_data: Dict[str, Any],
+    locks: Dict[str, str],
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Dict[str, Any]:
+    """
+    Playoff odds with some remaining games' winners locked in.
+    `locks` maps game_key ("week-team1-team2") to the winning team id.
+    """
+    if not league_data["teams"]:
+        return {"locks": locks, "method": "unconditioned", "simulations": 0, "conditioned_rows": 0, "odds": []}
+    sim = whatif_simulation(league_data, locks, simulations, seed, exact_max_games, target_width)
+    return {
+        "locks": locks,
+        "method": sim["method"],
+        "simulations": sim["simulations"],
+        "conditioned_rows": sim["conditioned_rows"],
+        "odds": odds_from_simulation(sim, league_data["teams"]),
+    }
+
+def scenario_stats(sim: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Per-team playoff counts and per-game winner shares among each team's
+    successful rows. Computed for every team in one pass over the packed
+    outcome matrix and kept on the simulation artifact.
+    """
+    stats = sim.get("scenario_stats")
+    if stats is None:
+        made = sim["made"]
+        weights = sim["weights"]
+        success_prob = weights @ made
+        # The extra all-True column yields each game's overall team 1 win
+        # probability from the same pass
+        columns = np.column_stack([made, np.ones(len(made), dtype=bool)])
+        sums = weighted_outcome_sums(sim["outcome_bits"], sim["num_games"], columns, weights)
+        team1_weight, team1_prob = sums[:-1], sums[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            team1_share = np.where(success_prob[:, None] > 0, team1_weight / success_prob[:, None], 0.0)
+        stats = {
+            "success_count": made.sum(axis=0),
+            "success_prob": success_prob,
+            "team1_share": team1_share,
+            "team1_weight": team1_weight,
+            "team1_prob": team1_prob,
+        }
+        sim["scenario_stats"] = stats
+    return stats
+
+def leverage_matrix(sim: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    P(playoffs | team 1 wins) and P(playoffs | team 2 wins) for every team
+    and game, as (teams x games) matrices, plus their difference
+    ("leverage"). Derived from scenario_stats, so one pass over the outcome
+    matrix serves every team and game. Games that one side never won in
+    the sample get zero leverage.
+    """
+    stats = scenario_stats(sim)
+    team1_prob = stats["team1_prob"]
+    team1_weight = stats["team1_weight"]
+    success_prob = stats["success_prob"][:, None]
+    played_both_ways = (team1_prob > 0) & (team1_prob < 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if_team1 = np.where(played_both_ways, team1_weight / team1_prob, success_prob)
+        if_team2 = np.where(played_both_ways, (success_prob - team1_weight) / (1 - team1_prob), success_prob)
+    if_team1 = np.clip(if_team1, 0.0, 1.0)
+    if_team2 = np.clip(if_team2, 0.0, 1.0)
+    return {"if_team1": if_team1, "if_team2": if_team2, "leverage": if_team1 - if_team2}
+
+def leverage_table(
+    league_data: LeagueInput,
+    team_id: Optional[str] = None,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> List[Dict[str, Any]]:
+    """
+    How much each remaining game swings each team's playoff odds:
+    P(playoffs | team 1 wins) - P(playoffs | team 2 wins), in percentage
+    points. Games are sorted by their largest swing for any team (or for
+    `team_id` only), and each game's teams by the size of their swing.
+    Games between two decided teams can't move anyone and are left out.
+    """
+    teams = league_teams(league_data)
+    if not teams:
+        return []
+    sim = get_simulation(league_data, simulations, seed, exact_max_games, target_width)
+    plan = sim["plan"]
+    arrays = sim["arrays"]
+    if team_id is not None and team_id not in plan.team_index:
+        raise ValueError(f"Unknown team: {team_id}")
+
+    with span("analyze"):
+        matrix = leverage_matrix(sim)
+        team1_prob = scenario_stats(sim)["team1_prob"]
+        teams_map = {team["id"]: team for team in teams}
+        team_ids = [team_id] if team_id is not None else arrays["team_ids"]
+
+        games = []
+        for g, game_key in enumerate(arrays["game_keys"]):
+            t1_id = arrays["team_ids"][arrays["team1_idx"][g]]
+            t2_id = arrays["team_ids"][arrays["team2_idx"][g]]
+            rows = []
+            for tid in team_ids:
+                i = plan.team_index[tid]
+                rows.append({
+                    "team_id": tid,
+                    "team_name": teams_map[tid]["name"],
+                    "if_team1_wins": round(float(matrix["if_team1"][i, g]) * 100, 1),
+                    "if_team2_wins": round(float(matrix["if_team2"][i, g]) * 100, 1),
+                    "leverage": round(float(matrix["leverage"][i, g]) * 100, 1),
+                })
+            rows.sort(key=lambda r: -abs(r["leverage"]))
+            games.append({
+                "game_key": game_key,
+                "week": int(arrays["game_weeks"][g]),
+                "team1_id": t1_id,
+                "team1_name": teams_map[t1_id]["name"],
+                "team2_id": t2_id,
+                "team2_name": teams_map[t2_id]["name"],
+                "team1_win_probability": round(float(team1_prob[g]) * 100, 1),
+                "max_leverage": max(abs(r["leverage"]) for r in rows),
+                "teams": rows,
+            })
+
+    return sorted(games, key=lambda x: (-x["max_leverage"], x["week"]))
+
+def _team_scenarios(sim: Dict[str, Any], teams_map: Dict[str, Dict[str, Any]], focus_team_id: str) -> Dict[str, Any]:
+    """
+    Builds the scenario report for one team from the shared statistics.
+    """
+    arrays = sim["arrays"]
+    stats = scenario_stats(sim)
+    total_rows = len(sim["weights"])
+
+    team_pos = sim["plan"].team_index.get(focus_team_id)
+    if team_pos is not None:
+        total_success = int(stats["success_count"][team_pos])
+    else:
+        total_success = 0
+
     if total_success == 0:
+        if sim["exact"]:
+            message = f"None of the {total_rows} possible outcomes lead to the playoffs."
+        else:
+            message = f"No scenarios found in {total_rows} simulations. Extremely unlikely."
         return {
             "team_id": focus_team_id,
             "probability": 0.0,
-            "message": "No scenarios found in 2000 simulations. Extremely unlikely.",
+            "message": message,
             "conditions": []
         }
-        
-    # Count outcome frequencies in successful sims
-    # Key: game_key, Value: {winner_id: count}
-    outcome_counts = {}
-    
-    for results in successful_sims:
-        for game_key, winner_id in results.items():
-            if game_key not in outcome_counts:
-                outcome_counts[game_key] = {}
-            outcome_counts[game_key][winner_id] = outcome_counts[game_key].get(winner_id, 0) + 1
-            
+
+    # Weighted share of successful runs in which team 1 won each game
+    success_prob = stats["success_prob"][team_pos]
+    team1_share = stats["team1_share"][team_pos]
+
     conditions = []
-    
+
     # Identify critical games
-    for game_key, counts in outcome_counts.items():
-        week, t1_id, t2_id = game_key.split('-')
-        
+    for g, game_key in enumerate(arrays["game_keys"]):
+        week = arrays["game_weeks"][g]
+        t1_id = arrays["team_ids"][arrays["team1_idx"][g]]
+        t2_id = arrays["team_ids"][arrays["team2_idx"][g]]
+
         # Determine the "needed" winner
         # If one winner appears in > 70% of successful sims, it's a condition
-        for winner_id, count in counts.items():
-            frequency = count / total_success
+        for winner_id, frequency in ((t1_id, team1_share[g]), (t2_id, 1.0 - team1_share[g])):
+            frequency = float(frequency)
             if frequency >= 0.70:
                 opponent_id = t2_id if winner_id == t1_id else t1_id
-                
+
                 winner_name = teams_map[winner_id]["name"]
                 opponent_name = teams_map[opponent_id]["name"]
-                
+
                 is_own_game = (winner_id == focus_team_id or opponent_id == focus_team_id)
-                
+
                 condition_type = "MUST" if frequency >= 0.99 else "SHOULD"
-                
+
                 desc = ""
                 if winner_id == focus_team_id:
                     desc = f"Win vs {opponent_name} (Week {week})"
@@ -198,7 +593,7 @@ def analyze_team_scenarios(league_data: LeagueData, focus_team_id: str) -> Dict[
                     desc = f"Avoid loss vs {winner_name} (Week {week})" # Should not happen if we check winner_id
                 else:
                     desc = f"Need {winner_name} to beat {opponent_name} (Week {week})"
-                
+
                 conditions.append({
                     "game_key": game_key,
                     "week": int(week),
@@ -207,13 +602,64 @@ def analyze_team_scenarios(league_data: LeagueData, focus_team_id: str) -> Dict[
                     "is_own_game": is_own_game,
                     "needed_winner_id": winner_id
                 })
-                
+
     # Sort conditions: Own games first, then by frequency (desc), then by week
     conditions.sort(key=lambda x: (not x["is_own_game"], -x["frequency"], x["week"]))
-    
+
+    if sim["exact"]:
+        message = f"{total_success} of {total_rows} possible outcomes lead to the playoffs."
+    else:
+        message = f"Found {total_success} paths to playoffs in {total_rows} simulations."
+
+    if sim["exact"]:
+        # Avoid float drift (e.g. 99.99999) when every outcome succeeds
+        probability = 100.0 if total_success == total_rows else float(success_prob) * 100
+    else:
+        probability = (total_success / total_rows) * 100
+
     return {
         "team_id": focus_team_id,
-        "probability": (total_success / SIMULATIONS) * 100,
-        "message": f"Found {total_success} paths to playoffs in {SIMULATIONS} simulations.",
+        "probability": probability,
+        "message": message,
         "conditions": conditions
     }
+
+def analyze_team_scenarios(
+    league_data: LeagueData,
+    focus_team_id: str,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> Dict[str, Any]:
+    """
+    Analyzes specific scenarios for a team to make the playoffs.
+    Returns a list of necessary and helpful conditions.
+    """
+    if not league_data.teams:
+        return {
+            "team_id": focus_team_id,
+            "probability": 0.0,
+            "message": "The league has no teams.",
+            "conditions": []
+        }
+    sim = get_simulation(league_data, simulations, seed, exact_max_games, target_width)
+    with span("analyze"):
+        return _team_scenarios(sim, {team["id"]: team for team in league_teams(league_data)}, focus_team_id)
+
+def analyze_all_scenarios(
+    league_data: LeagueData,
+    simulations: int = SIMULATIONS,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = TARGET_CI_WIDTH,
+) -> List[Dict[str, Any]]:
+    """
+    Scenario analysis for every team from the same simulation.
+    """
+    if not league_data.teams:
+        return []
+    sim = get_simulation(league_data, simulations, seed, exact_max_games, target_width)
+    teams_map = {team["id"]: team for team in league_teams(league_data)}
+    with span("analyze"):
+        return [_team_scenarios(sim, teams_map, team_id) for team_id in teams_map]
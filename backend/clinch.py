@@ -0,0 +1,179 @@
+from collections import deque
+from itertools import combinations
+from math import comb
+from typing import List, Dict, Any, Optional, Tuple
+
+from .simulation import tiebreak_ranks
+
+# Above this many candidate subsets we stop searching exhaustively and rely
+# on greedy certificates and counting bounds instead.
+COMBINATION_LIMIT = 2000
+
+def max_flow(capacity: Dict[Any, Dict[Any, int]], source: Any, sink: Any) -> int:
+    """
+    Edmonds-Karp max-flow. `capacity` is a dict-of-dicts adjacency map and is
+    consumed as the residual graph.
+    """
+    flow = 0
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            node = queue.popleft()
+            for nxt, cap in capacity.get(node, {}).items():
+                if cap > 0 and nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+        if sink not in parent:
+            return flow
+
+        # Capacities are integers, so pushing one unit per path is always valid
+        node = sink
+        while parent[node] is not None:
+            prev = parent[node]
+            capacity[prev][node] -= 1
+            capacity.setdefault(node, {})
+            capacity[node][prev] = capacity[node].get(prev, 0) + 1
+            node = prev
+        flow += 1
+
+def _max_assignment(games: List[Tuple[int, int]], caps: Dict[int, int]) -> int:
+    """
+    Maximum number of `games` whose win can be handed to an endpoint listed
+    in `caps` without any team receiving more than its cap.
+    """
+    source, sink = "source", "sink"
+    capacity: Dict[Any, Dict[Any, int]] = {source: {}}
+    for g, (a, b) in enumerate(games):
+        capacity[source][("game", g)] = 1
+        capacity[("game", g)] = {("team", t): 1 for t in (a, b) if t in caps}
+    for team, cap in caps.items():
+        capacity[("team", team)] = {sink: cap}
+    return max_flow(capacity, source, sink)
+
+def _can_make_playoffs(x: int, wins: List[int], tiebreak: List[int], games: List[Tuple[int, int]], playoff_spots: int) -> Optional[bool]:
+    """
+    Whether team `x` can still finish in the top `playoff_spots`.
+    Returns None if the question could not be settled within the limits.
+    """
+    # Best case: x wins out. Every other team j then has to stay at or
+    # below `caps[j]` wins to finish behind x.
+    best = wins[x] + sum(1 for g in games if x in g)
+    others = [j for j in range(len(wins)) if j != x]
+    caps = {j: best - wins[j] - (1 if tiebreak[j] > tiebreak[x] else 0) for j in others}
+    above = {j for j in others if caps[j] < 0}
+    slots = playoff_spots - 1 - len(above)
+    if slots < 0:
+        return False
+
+    # Games involving a team already above x can simply go to that team
+    pool = [(a, b) for a, b in games if x not in (a, b) and a not in above and b not in above]
+    capped = {j: caps[j] for j in others if j not in above}
+
+    def fits(uncapped) -> bool:
+        sub = [(a, b) for a, b in pool if a not in uncapped and b not in uncapped]
+        sub_caps = {j: c for j, c in capped.items() if j not in uncapped}
+        return _max_assignment(sub, sub_caps) == len(sub)
+
+    if fits(()):
+        return True
+    if slots == 0:
+        return False
+
+    pool_games = {j: sum(1 for g in pool if j in g) for j in capped}
+    excess = {j: pool_games[j] - capped[j] for j in capped if pool_games[j] > capped[j]}
+    candidates = sorted(excess, key=lambda j: -excess[j])
+    if len(candidates) <= slots:
+        return True
+
+    if comb(len(candidates), slots) <= COMBINATION_LIMIT:
+        return any(fits(set(group)) for group in combinations(candidates, slots))
+
+    if fits(set(candidates[:slots])):
+        return True
+
+    # Letting one more team pass x raises the max-flow by at most its excess
+    deficit = len(pool) - _max_assignment(pool, capped)
+    if sum(excess[j] for j in candidates[:slots]) < deficit:
+        return False
+    return None
+
+def _can_miss_playoffs(x: int, wins: List[int], tiebreak: List[int], games: List[Tuple[int, int]], playoff_spots: int) -> Optional[bool]:
+    """
+    Whether team `x` can still finish outside the top `playoff_spots`.
+    Returns None if the question could not be settled within the limits.
+    """
+    # Worst case: x loses out. Team j needs `need[j]` more wins to pass x.
+    worst = wins[x]
+    others = [j for j in range(len(wins)) if j != x]
+    boosted = {j: wins[j] + sum(1 for g in games if x in g and j in g) for j in others}
+    need = {j: worst + (0 if tiebreak[j] > tiebreak[x] else 1) - boosted[j] for j in others}
+    above = {j for j in others if need[j] <= 0}
+    missing = playoff_spots - len(above)
+    if missing <= 0:
+        return True
+
+    pool = [(a, b) for a, b in games if x not in (a, b)]
+    pool_games = {j: sum(1 for g in pool if j in g) for j in others}
+    candidates = sorted(
+        (j for j in others if j not in above and need[j] <= pool_games[j]),
+        key=lambda j: need[j],
+    )
+    if len(candidates) < missing:
+        return False
+
+    def reachable(group) -> bool:
+        group_caps = {j: need[j] for j in group}
+        sub = [(a, b) for a, b in pool if a in group_caps or b in group_caps]
+        return _max_assignment(sub, group_caps) == sum(group_caps.values())
+
+    if comb(len(candidates), missing) <= COMBINATION_LIMIT:
+        return any(reachable(group) for group in combinations(candidates, missing))
+
+    if reachable(candidates[:missing]):
+        return True
+
+    # Each game hands at most one win to the passing group
+    touching = sum(1 for a, b in pool if a in candidates or b in candidates)
+    if sum(need[j] for j in candidates[:missing]) > touching:
+        return False
+    return None
+
+def clinch_status(league_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Deterministic clinch/elimination flags for every team.
+
+    Uses the sports-elimination max-flow formulation extended to the top
+    `playoff_spots` places, with the same Wins then Points For ordering as
+    the simulation. `determined` is False when a question could not be
+    settled within COMBINATION_LIMIT; the flags are then left False.
+    """
+    teams_data = league_data["teams"]
+    playoff_spots = league_data["playoff_spots"]
+
+    team_index = {t["id"]: i for i, t in enumerate(teams_data)}
+    wins = [t["wins"] for t in teams_data]
+    tiebreak = tiebreak_ranks([t["points_for"] for t in teams_data])
+
+    games = []
+    for game in league_data["schedule"]:
+        if game.get("completed", False):
+            continue
+        t1 = team_index.get(game["team1_id"])
+        t2 = team_index.get(game["team2_id"])
+        if t1 is not None and t2 is not None:
+            games.append((t1, t2))
+
+    results = []
+    for x, team in enumerate(teams_data):
+        can_make = _can_make_playoffs(x, wins, tiebreak, games, playoff_spots)
+        can_miss = _can_miss_playoffs(x, wins, tiebreak, games, playoff_spots)
+        results.append({
+            "team_id": team["id"],
+            "team_name": team["name"],
+            "clinched_playoffs": can_miss is False,
+            "eliminated": can_make is False,
+            "determined": can_make is not None and can_miss is not None,
+        })
+
+    return results
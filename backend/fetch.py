@@ -0,0 +1,146 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import PAGE_FETCHES, UPSTREAM_IN_FLIGHT, span
+from .page_cache import Page, create_page_cache
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 10
+MAX_WORKERS = 8 # Concurrent page fetches across all hosts
+PER_HOST_LIMIT = 4 # Concurrent requests to any one host
+POOL_SIZE = 8 # Keep-alive connections kept per host
+RETRIES = 3
+BACKOFF_FACTOR = 0.5 # Sleeps 0.5s, 1s, 2s between retries
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fetch")
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+_page_cache = create_page_cache()
+
+def get_page_cache():
+    return _page_cache
+
+def set_page_cache(cache) -> None:
+    """
+    Swaps the page cache backend (MemoryPageCache, DiskPageCache or None to
+    disable caching).
+    """
+    global _page_cache
+    _page_cache = cache
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared session. Its connection pool keeps connections alive
+    across the league page and every schedule page.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_limits[host]
+
+def _get(url: str, headers: Optional[Dict[str, str]], timeout: float) -> requests.Response:
+    with _host_limit(url), UPSTREAM_IN_FLIGHT.track(), span("fetch"):
+        response = get_session().get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+def fetch(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = TIMEOUT, ttl: Optional[float] = 0) -> Page:
+    """
+    GETs a page through the shared pool, retrying transient failures with
+    exponential backoff. Raises requests.RequestException on failure.
+
+    Pages are cached by URL for `ttl` seconds (None caches forever, 0 means
+    revalidate on every call, even if an earlier call cached the page for
+    longer). Stale pages are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 reuses the cached body.
+    """
+    cache = _page_cache
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and ttl != 0 and cached.is_fresh():
+        PAGE_FETCHES.inc(result="fresh")
+        return cached
+
+    request_headers = dict(headers or {})
+    if cached is not None:
+        if cached.etag:
+            request_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            request_headers["If-Modified-Since"] = cached.last_modified
+
+    response = _get(url, request_headers, timeout)
+    expires_at = None if ttl is None else time.time() + ttl
+
+    if cached is not None and response.status_code == 304:
+        PAGE_FETCHES.inc(result="revalidated")
+        cached.expires_at = expires_at
+        cache.set(url, cached)
+        return cached
+
+    PAGE_FETCHES.inc(result="downloaded")
+    page = Page(
+        url=response.url,
+        content=response.content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        expires_at=expires_at,
+    )
+    if cache is not None:
+        cache.set(url, page)
+    return page
+
+def fetch_all(
+    urls: List[str],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = TIMEOUT,
+    ttls: Optional[List[Optional[float]]] = None,
+) -> List[Union[Page, Exception]]:
+    """
+    Fetches several pages concurrently. Results are returned in the order of
+    `urls`; a page that failed is returned as its exception. `ttls` gives
+    the cache TTL for each URL (see fetch).
+    """
+    ttls = ttls if ttls is not None else [0] * len(urls)
+    # Each fetch runs in a copy of the caller's context so its spans are
+    # attributed to the request that asked for it
+    futures = [
+        _executor.submit(contextvars.copy_context().run, fetch, url, headers, timeout, ttl)
+        for url, ttl in zip(urls, ttls)
+    ]
+    results: List[Union[Page, Exception]] = []
+    for url, future in zip(urls, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            results.append(e)
+    return results
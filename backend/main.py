@@ -1,11 +1,181 @@
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import contextvars
+import functools
+import json
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from backend.scraper import scrape_league
-from backend.calculator import calculate_odds, analyze_team_scenarios
-from backend.models import LeagueData
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from backend.scraper import scrape_league, scrape_league_header
+from backend.calculator import SIMULATION_CACHE, calculate_odds, analyze_team_scenarios, analyze_all_scenarios, get_simulation, iter_odds, leverage_table, whatif_odds
+from backend.clinch import clinch_status
+from backend.models import BatchOddsRequest, LeagueData, WhatIfRequest
+from backend.plan import league_state_key
+from backend.metrics import REQUEST_SECONDS, Counter, Gauge, render_metrics, start_timings
+from backend.refresh import LeagueRefresher
+from backend.responses import FastJSONResponse, cached_json, dumps, etag_matches, not_modified, state_etag
+from backend.singleflight import SingleFlight
 
-app = FastAPI(title="NFL Fantasy Playoff Calculator")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    league_refresher.start()
+    yield
+    await league_refresher.stop()
+
+app = FastAPI(title="NFL Fantasy Playoff Calculator", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Scraping and simulation block, so they run here instead of on the event loop.
+# Scrapes mostly wait on NFL.com (rate limited per host in fetch.py), so they
+# get their own larger pool and can't starve the CPU-bound simulations.
+WORKER_THREADS = 4
+SCRAPE_THREADS = 16
+work_pool = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="league")
+scrape_pool = ThreadPoolExecutor(max_workers=SCRAPE_THREADS, thread_name_prefix="scrape")
+
+# Most leagues one /api/leagues/odds request may ask for
+MAX_BATCH_LEAGUES = 50
+
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 1000
+
+# Concurrent requests for the same league state share one simulation, keyed
+# by league_state_key so a refreshed state never joins a run of the old
+# one; scrapes are coalesced by league_refresher, and league header scrapes
+# for the stream by header_flights
+simulation_flights = SingleFlight()
+header_flights = SingleFlight()
+
+# Queues of the odds streams following each league state's in-flight
+# simulation, by league_state_key
+progress_listeners: Dict[str, Set[asyncio.Queue]] = {}
+
+# Age of the league data behind the current response, sent as the Age header
+response_age: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("response_age", default=None)
+
+Counter("playoff_simulation_cache_hits_total", "Simulation cache hits.").set_function(lambda: SIMULATION_CACHE.hits)
+Counter("playoff_simulation_cache_misses_total", "Simulation cache misses.").set_function(lambda: SIMULATION_CACHE.misses)
+Gauge("playoff_simulation_cache_hit_ratio", "Simulation cache hits / lookups since start.").set_function(
+    lambda: SIMULATION_CACHE.hits / max(SIMULATION_CACHE.hits + SIMULATION_CACHE.misses, 1)
+)
+Gauge("playoff_simulation_cache_bytes", "Memory held by cached simulations.").set_function(
+    lambda: SIMULATION_CACHE.total_bytes
+)
+
+async def run_blocking(fn: Callable, *args: Any, pool: Optional[ThreadPoolExecutor] = None) -> Any:
+    """
+    Runs a blocking call on the worker pool (or `pool`) without stalling the
+    event loop. The call runs in a copy of the caller's context, so its
+    timing spans land on the request that made it.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(pool or work_pool, functools.partial(context.run, fn, *args))
+
+async def scrape(league_id: str) -> Dict[str, Any]:
+    return await run_blocking(scrape_league, league_id, pool=scrape_pool)
+
+async def load_simulation(league_id: str, league_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Makes sure the league's simulation is cached, running it at most once
+    for concurrent requests with the same league state.
+    """
+    key = league_state_key(league_data)
+    return await simulation_flights.do(key, lambda: run_blocking(get_simulation, league_data))
+
+async def simulate_with_progress(key: str, league_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs the league's simulation batch by batch (see iter_odds), handing
+    every provisional odds table to the streams in progress_listeners
+    under `key`, the league_state_key.
+    """
+    progress = iter_odds(league_data)
+    try:
+        while True:
+            update = await run_blocking(next, progress, None)
+            if update is None or update["final"]:
+                break
+            for queue in progress_listeners.get(key, ()):
+                queue.put_nowait(update)
+    finally:
+        await run_blocking(progress.close)
+    return await run_blocking(get_simulation, league_data)
+
+async def iter_progress(league_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Provisional odds tables while the league's simulation runs. Starts the
+    simulation if none is in flight for this league state and otherwise
+    follows the one that is, so concurrent streams and /odds requests
+    share a single run. A run
+    started by /odds reports no progress, only its end.
+    """
+    key = league_state_key(league_data)
+    queue: asyncio.Queue = asyncio.Queue()
+    progress_listeners.setdefault(key, set()).add(queue)
+    flight = asyncio.ensure_future(simulation_flights.do(key, lambda: simulate_with_progress(key, league_data)))
+    try:
+        while True:
+            update = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({update, flight}, return_when=asyncio.FIRST_COMPLETED)
+            if update not in done:
+                update.cancel()
+                break
+            yield update.result()
+        flight.result()
+        while not queue.empty():
+            yield queue.get_nowait()
+    finally:
+        # Leaving early only stops following; the shared run carries on
+        flight.cancel()
+        listeners = progress_listeners.get(key)
+        if listeners is not None:
+            listeners.discard(queue)
+            if not listeners:
+                del progress_listeners[key]
+
+# Recently requested leagues are served from memory and re-scraped (and
+# re-simulated) in the background, see refresh.LeagueRefresher
+league_refresher = LeagueRefresher(scrape, warm=load_simulation)
+
+Gauge("playoff_leagues_tracked", "Leagues kept warm by the background refresher.").set_function(
+    lambda: len(league_refresher)
+)
+
+# League responses may be reused until the data behind them is due for a
+# background refresh (the Age header counts from the scrape), then served
+# stale while revalidating, which the ETag turns into a cheap 304
+CACHE_CONTROL = "public, max-age={0}, stale-while-revalidate={0}".format(int(league_refresher.refresh_interval))
+
+async def load_league(league_id: str) -> Dict[str, Any]:
+    """
+    The league's last good scrape, loading it on first request. Records
+    its age for the response's Age header.
+    """
+    league_data, age = await league_refresher.get(league_id)
+    ages = response_age.get()
+    if ages is not None:
+        ages["age"] = max(ages.get("age", 0.0), age)
+    return league_data
+
+async def load_odds(league_id: str) -> List[Dict[str, Any]]:
+    """
+    Scrapes, simulates and formats the odds for one league.
+    """
+    return await compute_odds(league_id, await load_league(league_id))
+
+async def compute_odds(league_id: str, league_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    await load_simulation(league_id, league_data)
+    return await run_blocking(calculate_odds, league_data)
+
+def sse_event(event: str, data: Any) -> str:
+    """
+    Formats one Server-Sent Event.
+    """
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
 
 # Configure CORS
 app.add_middleware(
@@ -16,43 +186,232 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """
+    Records request latency and the request's stage spans. Spans are sent
+    back as a Server-Timing header; with `?debug=1` a JSON response is
+    wrapped as {"data": ..., "timings": ...} with the full span list.
+    """
+    timings = start_timings()
+    ages: Dict[str, float] = {}
+    response_age.set(ages)
+    response = await call_next(request)
+    total = time.perf_counter() - timings.started
+    if "age" in ages:
+        response.headers["Age"] = str(int(ages["age"]))
+
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(total, route=route.path if route else "unmatched", status=response.status_code)
+    response.headers["Server-Timing"] = timings.server_timing(total)
+
+    debug = request.query_params.get("debug", "").lower() in ("1", "true")
+    if debug and response.headers.get("content-type") == "application/json":
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")}
+        return FastJSONResponse(
+            {"data": json.loads(body), "timings": timings.breakdown(total)},
+            status_code=response.status_code,
+            headers=headers,
+        )
+    return response
+
+# Added after record_timings so it wraps it and compresses the final body.
+# GZipMiddleware leaves event streams uncompressed so events aren't held back.
+app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_BYTES, compresslevel=6)
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Stage histograms, request latency, cache and in-flight counters in the
+    Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def read_root():
     return {"status": "healthy", "message": "NFL Fantasy Playoff Calculator API is running"}
 
 @app.get("/api/league/{league_id}")
-def get_league_info(league_id: str):
+async def get_league_info(league_id: str, request: Request):
     """
     Fetches current league state (standings, teams, settings).
+    The ETag covers the whole payload, so unchanged polls get a 304.
     """
     try:
-        league_data = scrape_league(league_id)
-        return league_data
+        league_data = await load_league(league_id)
+        return cached_json(request, league_data, CACHE_CONTROL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/league/{league_id}/odds")
-async def get_playoff_odds(league_id: str):
+async def get_playoff_odds(league_id: str, request: Request):
     """
     Calculates playoff odds based on current standings and remaining schedule.
+    Revalidating with the ETag answers 304 without simulating.
+    """
+    try:
+        league_data = await load_league(league_id)
+        etag = state_etag(request, league_data)
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
+        odds = await compute_odds(league_id, league_data)
+        return cached_json(request, odds, CACHE_CONTROL, etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/leagues/odds")
+async def get_batch_odds(request: BatchOddsRequest):
+    """
+    Playoff odds for many leagues at once, streamed as NDJSON: one line per
+    league as soon as it finishes, {"league_id", "status": "ok", "odds"} or
+    {"league_id", "status": "error", "detail"}. Leagues are scraped and
+    simulated concurrently, and one league failing doesn't affect the others.
+    """
+    league_ids = list(dict.fromkeys(request.league_ids))
+    if len(league_ids) > MAX_BATCH_LEAGUES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_LEAGUES} leagues per request")
+
+    async def league_result(league_id: str) -> Dict[str, Any]:
+        try:
+            return {"league_id": league_id, "status": "ok", "odds": await load_odds(league_id)}
+        except Exception as e:
+            return {"league_id": league_id, "status": "error", "detail": str(e)}
+
+    async def results():
+        tasks = [asyncio.ensure_future(league_result(league_id)) for league_id in league_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield dumps(await next_done) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.get("/api/league/{league_id}/odds/stream")
+async def stream_playoff_odds(league_id: str):
+    """
+    Streams playoff odds as Server-Sent Events while they are computed:
+    a `league` event with the name and standings as soon as the league page
+    is parsed, an `odds` event after every simulation batch (`final` marks
+    the last one, which matches /odds), then `done`. Failures are sent as
+    an `error` event since the response has already started.
+
+    The league comes from league_refresher like every other endpoint, and
+    the simulation is shared with concurrent streams and /odds requests
+    (see iter_progress).
+    """
+    async def events():
+        try:
+            if league_id in league_refresher:
+                league_data = await load_league(league_id)
+                yield sse_event("league", {**league_data, "schedule": []})
+            else:
+                header = await header_flights.do(
+                    league_id, lambda: run_blocking(scrape_league_header, league_id, pool=scrape_pool)
+                )
+                yield sse_event("league", header)
+                # The league page was just fetched, so this only adds the schedule pages
+                league_data = await load_league(league_id)
+
+            async for update in iter_progress(league_data):
+                yield sse_event("odds", update)
+            odds = await compute_odds(league_id, league_data)
+            simulations = odds[0]["simulations"] if odds else 0
+            yield sse_event("odds", {"final": True, "simulations": simulations, "odds": odds})
+            yield sse_event("done", {})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/league/{league_id}/whatif")
+async def get_whatif_odds(league_id: str, request: WhatIfRequest):
+    """
+    Playoff odds with some remaining games locked, e.g.
+    {"locks": {"13-3-4": "3"}} for team 3 beating team 4 in week 13.
+    Answered from the league's cached simulation where possible.
     """
     try:
-        league_data = scrape_league(league_id)
-        odds = calculate_odds(league_data)
-        return odds
+        league_data = await load_league(league_id)
+        await load_simulation(league_id, league_data)
+        return await run_blocking(whatif_odds, league_data, request.locks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/league/{league_id}/leverage")
+async def get_leverage(league_id: str, request: Request, team_id: Optional[str] = None):
+    """
+    Remaining games ranked by how much their result swings playoff odds,
+    for every team or just `team_id`.
+    """
+    try:
+        league_data = await load_league(league_id)
+        etag = state_etag(request, league_data)
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
+        await load_simulation(league_id, league_data)
+        table = await run_blocking(leverage_table, league_data, team_id)
+        return cached_json(request, table, CACHE_CONTROL, etag)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/league/{league_id}/status")
+async def get_clinch_status(league_id: str, request: Request):
+    """
+    Deterministic clinch/elimination status for every team.
+    Cheap to poll: no simulation is run.
+    """
+    try:
+        league_data = await load_league(league_id)
+        etag = state_etag(request, league_data)
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
+        status = await run_blocking(clinch_status, league_data)
+        return cached_json(request, status, CACHE_CONTROL, etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/league/{league_id}/scenarios")
+async def get_all_scenarios(league_id: str, request: Request):
+    """
+    Scenario analysis for every team, computed from a single simulation.
+    """
+    try:
+        data = await load_league(league_id)
+        etag = state_etag(request, data)
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
+        league_data = LeagueData(**data)
+        await load_simulation(league_id, league_data.dict())
+        scenarios = await run_blocking(analyze_all_scenarios, league_data)
+        return cached_json(request, scenarios, CACHE_CONTROL, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/league/{league_id}/scenarios/{team_id}")
-async def get_team_scenarios(league_id: str, team_id: str):
+async def get_team_scenarios(league_id: str, team_id: str, request: Request):
     """
     Analyzes specific scenarios for a team to make the playoffs.
     """
     try:
-        data = scrape_league(league_id)
+        data = await load_league(league_id)
+        etag = state_etag(request, data)
+        if etag_matches(request, etag):
+            return not_modified(etag, CACHE_CONTROL)
         league_data = LeagueData(**data)
-        scenarios = analyze_team_scenarios(league_data, team_id)
-        return scenarios
+        await load_simulation(league_id, league_data.dict())
+        scenarios = await run_blocking(analyze_team_scenarios, league_data, team_id)
+        return cached_json(request, scenarios, CACHE_CONTROL, etag)
     except Exception as e:
         import traceback
         traceback.print_exc()
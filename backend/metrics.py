@@ -0,0 +1,225 @@
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Seconds; spans range from sub-millisecond parses to multi-second scrapes
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metric:
+    """
+    A metric family in the Prometheus text format. Series are keyed by their
+    label values, in `labelnames` order. `set_function` makes the metric
+    read its unlabelled value from a callback at render time instead.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._function = fn
+
+    def _labels(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{value}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {float(self._function())}"]
+        with self._lock:
+            return [f"{self.name}{self._labels(key)} {float(value)}" for key, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """
+        Counts the enclosed block as in progress.
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._values.items():
+                bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, series["buckets"] + [series["count"]]):
+                    le = 'le="' + bound + '"'
+                    lines.append(f"{self.name}_bucket{self._labels(key, le)} {count}")
+                lines.append(f"{self.name}_sum{self._labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{self._labels(key)} {series['count']}")
+        return lines
+
+REGISTRY: List[Metric] = []
+
+def render_metrics() -> str:
+    """
+    Every registered metric in the Prometheus text exposition format.
+    """
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+STAGE_SECONDS = Histogram(
+    "playoff_stage_duration_seconds",
+    "Time spent per pipeline stage (fetch, parse, simulate, rank, analyze).",
+    ("stage",),
+)
+REQUEST_SECONDS = Histogram(
+    "playoff_request_duration_seconds",
+    "API request latency by route.",
+    ("route", "status"),
+)
+PAGE_FETCHES = Counter(
+    "playoff_page_fetches_total",
+    "NFL.com page lookups by result: fresh cache hit, revalidated (304) or downloaded.",
+    ("result",),
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "playoff_upstream_requests_in_flight",
+    "HTTP requests to NFL.com currently in progress.",
+)
+SCRAPES_IN_FLIGHT = Gauge(
+    "playoff_scrapes_in_flight",
+    "League scrapes (header or schedule stage) currently in progress.",
+)
+
+class Timings:
+    """
+    Spans recorded while serving one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []  # (stage, start offset, duration)
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, start: float, duration: float) -> None:
+        with self._lock:
+            self.spans.append((stage, start - self.started, duration))
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Stage -> summed duration in seconds. Concurrent spans (parallel page
+        fetches) are summed, so a stage can exceed the wall time.
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for stage, _, duration in self.spans:
+                totals[stage] = totals.get(stage, 0.0) + duration
+        return totals
+
+    def server_timing(self, total: float) -> str:
+        """
+        The Server-Timing header value, durations in milliseconds.
+        """
+        entries = [f"{stage};dur={duration * 1000:.1f}" for stage, duration in self.totals().items()]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def breakdown(self, total: float) -> Dict[str, Any]:
+        with self._lock:
+            spans = [
+                {"stage": stage, "start_ms": round(start * 1000, 2), "duration_ms": round(duration * 1000, 2)}
+                for stage, start, duration in self.spans
+            ]
+        return {
+            "total_ms": round(total * 1000, 2),
+            "stages_ms": {stage: round(d * 1000, 2) for stage, d in self.totals().items()},
+            "spans": spans,
+        }
+
+_timings: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar("timings", default=None)
+
+def start_timings() -> Timings:
+    """
+    Starts recording spans for the current request (context).
+    """
+    timings = Timings()
+    _timings.set(timings)
+    return timings
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator form of span.
+    """
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Times the enclosed block into the stage histogram and, when called
+    within a request, into that request's Timings. Worker threads see the
+    request only if they run in a copy of its context.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_SECONDS.observe(duration, stage=stage)
+        timings = _timings.get()
+        if timings is not None:
+            timings.add(stage, start, duration)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Team(BaseModel):
     id: str
@@ -30,6 +30,13 @@ class LeagueData(BaseModel):
     total_weeks: int
     playoff_spots: int
 
+    def simulation_plan(self):
+        """
+        The compiled plan.SimulationPlan for this league state (cached).
+        """
+        from .plan import get_plan
+        return get_plan(self)
+
 class PlayoffOdds(BaseModel):
     team_id: str
     team_name: str
@@ -37,3 +44,9 @@ class PlayoffOdds(BaseModel):
     clinched_playoffs: bool
     eliminated: bool
     scenarios: List[str]  # Description of key scenarios
+
+class WhatIfRequest(BaseModel):
+    locks: Dict[str, str]  # game_key ("week-team1-team2") -> winning team id
+
+class BatchOddsRequest(BaseModel):
+    league_ids: List[str]
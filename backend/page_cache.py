@@ -0,0 +1,168 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class Page:
+    """
+    A fetched page plus the validators needed to revalidate it.
+
+    `expires_at` is a wall-clock timestamp, or None for pages that never go
+    stale (completed weeks). Parsed results are memoized per page so a fresh
+    cache hit skips the HTML parser as well as the network.
+    """
+    __slots__ = ("url", "content", "etag", "last_modified", "expires_at", "_parsed")
+
+    def __init__(
+        self,
+        url: str,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        expires_at: Optional[float] = None,
+    ):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+        self._parsed: Dict[str, Any] = {}
+
+    def is_fresh(self) -> bool:
+        return self.expires_at is None or self.expires_at > time.time()
+
+    def parsed(self, name: str, parse: Callable[[bytes], Any]) -> Any:
+        """
+        Returns `parse(self.content)`, running the parser only once per page.
+        Callers get a copy so the memoized value is never mutated.
+        """
+        if name not in self._parsed:
+            self._parsed[name] = parse(self.content)
+        return copy.deepcopy(self._parsed[name])
+
+    def to_meta(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "expires_at": self.expires_at,
+        }
+
+class MemoryPageCache:
+    """
+    In-process page cache, evicted least-recently-used by total page size.
+    Stale pages are kept so they can be revalidated with a conditional GET.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._lru = LRUCache(max_bytes=max_bytes, sizeof=lambda page: len(page.content))
+
+    def get(self, key: str) -> Optional[Page]:
+        return self._lru.get(key)
+
+    def set(self, key: str, page: Page) -> None:
+        self._lru.set(key, page)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+class DiskPageCache:
+    """
+    Page cache persisted under `directory`, so it survives restarts.
+
+    Each page is stored as a body file plus a JSON metadata file. Reads bump
+    the file's mtime and eviction removes the oldest pages first once the
+    bodies exceed `max_bytes`. Recently used pages are also kept in memory
+    so their parsed results stay memoized.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, memory_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._memory = MemoryPageCache(memory_bytes)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str):
+        name = hashlib.sha256(key.encode()).hexdigest()
+        base = os.path.join(self.directory, name)
+        return base + ".body", base + ".json"
+
+    def get(self, key: str) -> Optional[Page]:
+        page = self._memory.get(key)
+        if page is not None:
+            return page
+
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                with open(body_path, "rb") as f:
+                    content = f.read()
+                os.utime(body_path)
+            except (OSError, ValueError):
+                return None
+
+        page = Page(content=content, **meta)
+        self._memory.set(key, page)
+        return page
+
+    def set(self, key: str, page: Page) -> None:
+        self._memory.set(key, page)
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                with open(body_path, "wb") as f:
+                    f.write(page.content)
+                with open(meta_path, "w") as f:
+                    json.dump(page.to_meta(), f)
+            except OSError as e:
+                logger.warning(f"Failed to write page cache entry for {key}: {e}")
+                return
+            self._evict()
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith((".body", ".json")):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _evict(self) -> None:
+        bodies = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            bodies.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+
+        for _, size, name in sorted(bodies):
+            if total <= self.max_bytes:
+                break
+            base = os.path.join(self.directory, name[:-len(".body")])
+            for path in (base + ".body", base + ".json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+def create_page_cache():
+    """
+    Disk-backed cache when PAGE_CACHE_DIR is set, in-memory otherwise.
+    """
+    directory = os.environ.get("PAGE_CACHE_DIR")
+    if directory:
+        return DiskPageCache(directory)
+    return MemoryPageCache()
@@ -0,0 +1,165 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .metrics import span
+from .simulation import resolve_outcomes, side_arrays, simulate_outcomes
+
+# Engine arrays the workers need, shared instead of pickled per task
+SHARED_KEYS = (
+    "t1_prob", "incidence", "base_wins", "team2_baseline", "tiebreak", "active", "clinched",
+    "side_t1_prob", "side_incidence", "side_team2_baseline",
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool, recreating it if the size changed.
+    Workers are spawned rather than forked since the API process runs threads.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def shard_sizes(total: int, shards: int) -> List[int]:
+    """
+    Splits `total` simulations into `shards` near-equal parts.
+    """
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+class SharedArrays:
+    """
+    Named arrays in one shared memory block, laid out from `shapes` (key ->
+    (shape, dtype)). Workers attach to it by name with attach_arrays; the
+    block is unlinked when the context exits. `meta` rides along in `spec`.
+    """
+
+    def __init__(self, shapes: Dict[str, Tuple[Tuple[int, ...], Any]], **meta: Any):
+        layout = []
+        offset = 0
+        for key, (shape, dtype) in shapes.items():
+            dtype = np.dtype(dtype)
+            layout.append((key, dtype.str, tuple(shape), offset))
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            offset += -(-nbytes // 8) * 8 # keep every array 8-byte aligned
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.spec = {"name": self.shm.name, "layout": layout, **meta}
+        self.arrays = _views(self.spec, self.shm)
+
+    @classmethod
+    def copy_of(cls, arrays: Dict[str, Any], keys: Tuple[str, ...], **meta: Any) -> "SharedArrays":
+        """
+        A block holding copies of `arrays[key]` for each of `keys`.
+        """
+        shared = cls({key: (np.shape(arrays[key]), np.asarray(arrays[key]).dtype) for key in keys}, **meta)
+        for key in keys:
+            shared.arrays[key][...] = arrays[key]
+        return shared
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # Views must go before the block can close
+        self.arrays = {}
+        self.shm.close()
+        self.shm.unlink()
+
+def _views(spec: Dict[str, Any], shm: shared_memory.SharedMemory) -> Dict[str, np.ndarray]:
+    return {
+        key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        for key, dtype, shape, start in spec["layout"]
+    }
+
+def attach_arrays(spec: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """
+    Worker side of SharedArrays: the block and views of its arrays. Close
+    the block once the views are dropped.
+    """
+    # Spawned workers share the parent's resource tracker, which unlinks the
+    # block once the parent releases it
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    return shm, _views(spec, shm)
+
+def _run_shard(
+    spec: Dict[str, Any],
+    output_spec: Dict[str, Any],
+    playoff_spots: int,
+    start: int,
+    size: int,
+    seed: np.random.SeedSequence,
+    positions: bool = False,
+) -> None:
+    """
+    Worker entry point: simulates one shard against the shared arrays and
+    writes its rows into the output block at `start`, so only the task
+    specs cross the process boundary.
+    """
+    shm, arrays = attach_arrays(spec)
+    output_shm, outputs = attach_arrays(output_spec)
+    try:
+        arrays["team_ids"] = spec["team_ids"]
+        rng = np.random.default_rng(seed)
+        outcomes = simulate_outcomes(arrays, size, rng)
+        side_outcomes = simulate_outcomes(side_arrays(arrays), size, rng) if positions else None
+        result = resolve_outcomes(arrays, outcomes, playoff_spots, side_outcomes)
+        for key, value in result.items():
+            outputs[key][start:start + size] = value
+        del arrays, outputs, result
+    finally:
+        shm.close()
+        output_shm.close()
+
+def iter_parallel_batches(
+    arrays: Dict[str, Any],
+    playoff_spots: int,
+    batch_size: int,
+    seed: Optional[int],
+    workers: int,
+    positions: bool = False,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Endless stream of simulation batches, each sharded across `workers`
+    processes. Every shard draws from its own child of SeedSequence(seed)
+    and shards are merged in order, so a given seed and worker count always
+    produces the same batches.
+    """
+    root = np.random.SeedSequence(seed)
+    sizes = shard_sizes(batch_size, workers)
+    starts = np.cumsum([0] + sizes[:-1]).tolist()
+    num_teams = len(arrays["team_ids"])
+    output_shapes = {
+        "outcome_bits": ((batch_size, -(-len(arrays["t1_prob"]) // 8)), np.uint8),
+        "made": ((batch_size, num_teams), bool),
+    }
+    if positions:
+        output_shapes["standings"] = ((batch_size, num_teams), np.uint8)
+    pool = get_pool(workers)
+    with SharedArrays.copy_of(arrays, SHARED_KEYS, team_ids=arrays["team_ids"]) as shared, \
+            SharedArrays(output_shapes) as output:
+        while True:
+            seeds = root.spawn(workers)
+            # Workers simulate and rank; their own spans stay in their process
+            with span("simulate"):
+                futures = [
+                    pool.submit(_run_shard, shared.spec, output.spec, playoff_spots, start, size, shard_seed, positions)
+                    for start, size, shard_seed in zip(starts, sizes, seeds)
+                ]
+                for future in futures:
+                    future.result()
+            # The block is rewritten by the next batch
+            yield {key: value.copy() for key, value in output.arrays.items()}
@@ -0,0 +1,220 @@
+import logging
+from typing import Dict, Any, List, Optional
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+LXML_AVAILABLE = lxml is not None
+
+def _classes(el) -> List[str]:
+    return el.get("class", "").split()
+
+def _text(el) -> str:
+    return el.text_content().strip()
+
+def _find(el, tag: str, cls: Optional[str] = None):
+    """
+    First descendant `tag` (optionally with class `cls`), like BeautifulSoup's find.
+    """
+    for child in el.iter(tag):
+        if child is el:
+            continue
+        if cls is None or cls in _classes(child):
+            return child
+    return None
+
+def _find_all(el, tag: str, cls: str):
+    return [child for child in el.iter(tag) if child is not el and cls in _classes(child)]
+
+def parse_score(text: str) -> Optional[float]:
+    """
+    A team's score from its `teamTotal` span, or None if it isn't a number.
+    """
+    try:
+        return float(text.strip().replace(',', ''))
+    except ValueError:
+        return None
+
+def _parse_team_row(row, record_cell) -> Optional[Dict[str, Any]]:
+    """
+    Mirrors scraper.parse_standings for a single standings row.
+    """
+    team_link = _find(row, "a", "teamName")
+    if team_link is None:
+        logger.warning("No team link found")
+        return None
+
+    team_name = _text(team_link)
+    team_id = team_link.get("href").split('/')[-1]
+
+    owner = "Unknown"
+    owner_span = _find(row, "span", "userName")
+    if owner_span is None:
+        owner_span = _find(row, "li", "userName")
+    if owner_span is not None:
+        owner = _text(owner_span)
+
+    # Format: "6-5-0"
+    wins, losses, ties = 0, 0, 0
+    parts = _text(record_cell).split('-')
+    if len(parts) >= 2:
+        wins = int(parts[0])
+        losses = int(parts[1])
+        if len(parts) > 2:
+            ties = int(parts[2])
+
+    # There are usually two 'teamPts' cells: PF and PA
+    pts_cells = _find_all(row, "td", "teamPts")
+    points_for = 0.0
+    points_against = 0.0
+    if len(pts_cells) >= 1:
+        points_for = float(_text(pts_cells[0]).replace(',', ''))
+    if len(pts_cells) >= 2:
+        points_against = float(_text(pts_cells[1]).replace(',', ''))
+
+    return {
+        "id": team_id,
+        "name": team_name,
+        "owner": owner,
+        "wins": wins,
+        "losses": losses,
+        "ties": ties,
+        "points_for": points_for,
+        "points_against": points_against,
+        "logo_url": None
+    }
+
+def _parse_score_strip(matchup_list, week: int) -> List[Dict[str, Any]]:
+    """
+    Mirrors scraper.parse_schedule for the `ul.ss` score strip.
+    """
+    schedule = []
+    for match in matchup_list.iter("li"):
+        if match is matchup_list:
+            continue
+        link = _find(match, "a")
+        if link is None:
+            continue
+        if " vs. " not in link.get("title", ""):
+            continue
+
+        first_div = _find(link, "div", "first")
+        last_div = _find(link, "div", "last")
+        if first_div is None or last_div is None:
+            continue
+
+        team1_span = _find(first_div, "span", "teamTotal")
+        team2_span = _find(last_div, "span", "teamTotal")
+        if team1_span is None or team2_span is None:
+            continue
+
+        # class="teamTotal teamId-11" -> extract 11
+        team1_id = next((c.split("-")[1] for c in _classes(team1_span) if c.startswith("teamId-")), "")
+        team2_id = next((c.split("-")[1] for c in _classes(team2_span) if c.startswith("teamId-")), "")
+
+        if team1_id and team2_id:
+            schedule.append({
+                "week": week,
+                "team1_id": team1_id,
+                "team2_id": team2_id,
+                "team1_score": parse_score(_text(team1_span)),
+                "team2_score": parse_score(_text(team2_span)),
+                "completed": False # Future games are not completed
+            })
+    return schedule
+
+def parse_page_lxml(content: bytes, week: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Single pass over a league page with lxml.
+
+    Collects the league name, standings rows, the team-id -> logo index,
+    the current week selector and the `ul.ss` score strip in one walk of
+    the document, instead of one full-document search per team.
+    """
+    root = lxml.html.fromstring(content)
+
+    league_name = None
+    week_li = None
+    matchup_list = None
+    rows = []
+    logo_links: Dict[str, Any] = {}
+
+    for el in root.iter("h1", "li", "ul", "tr", "a"):
+        tag = el.tag
+        if tag == "tr":
+            rows.append(el)
+        elif tag == "a":
+            # Same match as soup.find("a", class_="teamImg teamId-X"): the
+            # class attribute must be exactly "teamImg teamId-X"
+            cls = el.get("class", "")
+            if cls.startswith("teamImg teamId-") and " " not in cls[len("teamImg "):]:
+                logo_links.setdefault(cls[len("teamImg teamId-"):], el)
+        elif tag == "li":
+            if week_li is None and "wl" in _classes(el):
+                week_li = el
+        elif tag == "ul":
+            if matchup_list is None and "ss" in _classes(el):
+                matchup_list = el
+        elif tag == "h1":
+            if league_name is None and "leagueName" in _classes(el):
+                league_name = _text(el)
+
+    teams = []
+    for row in rows:
+        record_cell = _find(row, "td", "teamRecord")
+        if record_cell is None:
+            continue
+        try:
+            team = _parse_team_row(row, record_cell)
+        except Exception as e:
+            logger.warning(f"Failed to parse row: {e}")
+            continue
+        if team is not None:
+            teams.append(team)
+
+    for team in teams:
+        link = logo_links.get(team["id"])
+        if link is None:
+            continue
+        img_tag = _find(link, "img")
+        if img_tag is not None and img_tag.get("src"):
+            logo_url = img_tag.get("src")
+            # Make sure it's a full URL
+            if not logo_url.startswith("http"):
+                logo_url = f"https://fantasy.nfl.com{logo_url}"
+            team["logo_url"] = logo_url
+
+    current_week = None
+    if week_li is not None:
+        try:
+            current_week = int(_text(week_li).replace("Week ", "").strip())
+        except ValueError:
+            pass
+
+    schedule = []
+    if matchup_list is not None:
+        schedule = _parse_score_strip(matchup_list, week)
+    elif week is not None:
+        logger.warning(f"No matchup list found for week {week}")
+
+    # Private or invalid leagues (see scraper.parse_league_page)
+    text = root.text_content()
+    access_issue = "League Not Found" in text or "Private League" in text
+    error_message = None
+    if access_issue:
+        error_div = _find(root, "div", "error-message")
+        if error_div is not None:
+            error_message = _text(error_div)
+
+    return {
+        "name": league_name,
+        "teams": teams,
+        "current_week": current_week,
+        "schedule": schedule,
+        "access_issue": access_issue,
+        "error_message": error_message,
+    }
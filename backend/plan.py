@@ -0,0 +1,97 @@
+import hashlib
+import json
+from typing import Any, Dict, Union
+
+import numpy as np
+
+from .cache import LRUCache
+from .clinch import clinch_status
+from .models import LeagueData
+from .simulation import build_game_arrays
+
+# Anything get_plan accepts: the scraped league dict or its pydantic model
+LeagueInput = Union[Dict[str, Any], LeagueData]
+
+def decided_teams(league_data: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    Teams whose playoff fate is already settled: True if clinched,
+    False if eliminated. Undecided teams are left out.
+    """
+    decided = {}
+    for status in clinch_status(league_data):
+        if status["clinched_playoffs"]:
+            decided[status["team_id"]] = True
+        elif status["eliminated"]:
+            decided[status["team_id"]] = False
+    return decided
+
+def league_state_key(league_data: Dict[str, Any], **settings: Any) -> str:
+    """
+    Stable hash of everything that affects a simulation: teams, remaining
+    schedule, playoff spots and the engine settings.
+    """
+    payload = {
+        "teams": [
+            [t["id"], t["wins"], t["losses"], t["ties"], t["points_for"]]
+            for t in league_data["teams"]
+        ],
+        "schedule": [
+            [g["week"], g["team1_id"], g["team2_id"], g.get("completed", False)]
+            for g in league_data["schedule"]
+        ],
+        "playoff_spots": league_data["playoff_spots"],
+        "settings": settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class SimulationPlan:
+    """
+    Everything the engine needs for one league state, compiled once and
+    shared by every simulation, odds table and scenario report for it.
+
+    Team ids are interned to dense ints (their position in the league's
+    team list) and the remaining games to their column in the outcome
+    matrix; `arrays` holds the engine buffers from
+    simulation.build_game_arrays, with win probabilities precomputed per
+    game. Names and other display fields are left out: league_state_key
+    doesn't cover them, so they are read from the caller's league data.
+    """
+    __slots__ = ("key", "team_index", "game_index", "decided", "arrays", "playoff_spots")
+
+    def __init__(self, league_data: Dict[str, Any], key: str):
+        self.key = key
+        self.playoff_spots: int = league_data["playoff_spots"]
+        self.decided = decided_teams(league_data)
+        self.arrays = build_game_arrays(league_data["teams"], league_data["schedule"], self.decided)
+        self.team_index = {tid: i for i, tid in enumerate(self.arrays["team_ids"])}
+        self.game_index = {game_key: g for g, game_key in enumerate(self.arrays["game_keys"])}
+
+    def settings_key(self, **settings: Any) -> str:
+        """
+        Cache key for a simulation of this plan with the given settings.
+        """
+        return f"{self.key}:{json.dumps(settings, sort_keys=True)}"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the plan's engine arrays.
+        """
+        return sum(a.nbytes for a in self.arrays.values() if isinstance(a, np.ndarray))
+
+# Plans are small; keep one per recently seen league state
+PLAN_CACHE = LRUCache(max_bytes=64 * 1024 * 1024, ttl=15 * 60, max_entries=256, sizeof=lambda plan: plan.nbytes)
+
+def get_plan(league_data: LeagueInput) -> SimulationPlan:
+    """
+    Returns the compiled plan for this league state, compiling it on a miss.
+    Accepts the scraped dict or a LeagueData model.
+    """
+    if isinstance(league_data, LeagueData):
+        league_data = league_data.dict()
+    key = league_state_key(league_data)
+    plan = PLAN_CACHE.get(key)
+    if plan is None:
+        plan = SimulationPlan(league_data, key)
+        PLAN_CACHE.set(key, plan)
+    return plan
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Seconds between refreshes of a league that is still being requested.
+# Matches the league page TTL, so a refresh always revalidates the page.
+REFRESH_INTERVAL = float(os.environ.get("LEAGUE_REFRESH_INTERVAL", "300"))
+# Leagues nobody asked for in this long stop being refreshed and are dropped
+IDLE_TIMEOUT = float(os.environ.get("LEAGUE_IDLE_TIMEOUT", str(30 * 60)))
+MAX_LEAGUES = 200
+SWEEP_INTERVAL = 15.0
+
+class LeagueRefresher:
+    """
+    Serves the last good load of each recently requested league and keeps
+    it fresh in the background (stale-while-revalidate).
+
+    The first request for a league waits for `load`. Later requests get
+    the stored result at once, along with its age. Once it is older than
+    `refresh_interval`, a reload starts in the background, and `warm` (e.g.
+    running the simulation) finishes before the new result replaces the
+    old one. A failed refresh keeps serving the last good result. Leagues
+    idle for `idle_timeout` are dropped, and at most `max_leagues` are kept.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Awaitable[Dict[str, Any]]],
+        warm: Optional[Callable[[str, Dict[str, Any]], Awaitable[Any]]] = None,
+        refresh_interval: float = REFRESH_INTERVAL,
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_leagues: int = MAX_LEAGUES,
+        sweep_interval: float = SWEEP_INTERVAL,
+    ):
+        self.load = load
+        self.warm = warm
+        self.refresh_interval = refresh_interval
+        self.idle_timeout = idle_timeout
+        self.max_leagues = max_leagues
+        self.sweep_interval = sweep_interval
+        self._entries: Dict[str, Dict[str, Any]] = {}  # league id -> data, loaded_at, attempted_at, requested_at
+        self._flights = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+
+    async def get(self, league_id: str) -> Tuple[Dict[str, Any], float]:
+        """
+        Returns the league data and its age in seconds.
+        """
+        entry = self._entries.get(league_id)
+        if entry is None:
+            entry = await self._flights.do(league_id, lambda: self._reload(league_id, warm=False))
+
+        now = time.monotonic()
+        entry["requested_at"] = now
+        if self._due(entry, now):
+            self._refresh_in_background(league_id)
+        return entry["data"], now - entry["loaded_at"]
+
+    def sweep(self) -> None:
+        """
+        Drops idle leagues and starts refreshes for stale ones.
+        """
+        now = time.monotonic()
+        for league_id, entry in list(self._entries.items()):
+            if now - entry["requested_at"] > self.idle_timeout:
+                del self._entries[league_id]
+            elif self._due(entry, now):
+                self._refresh_in_background(league_id)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, league_id: str) -> bool:
+        return league_id in self._entries
+
+    def _due(self, entry: Dict[str, Any], now: float) -> bool:
+        # A failed refresh waits a full interval before retrying
+        return now - max(entry["loaded_at"], entry["attempted_at"]) >= self.refresh_interval
+
+    def _refresh_in_background(self, league_id: str) -> None:
+        if league_id in self._flights:
+            return
+        self._entries[league_id]["attempted_at"] = time.monotonic()
+        future = asyncio.ensure_future(self._flights.do(league_id, lambda: self._reload(league_id, warm=True)))
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def _reload(self, league_id: str, warm: bool) -> Dict[str, Any]:
+        try:
+            data = await self.load(league_id)
+            if warm and self.warm is not None:
+                await self.warm(league_id, data)
+        except Exception as e:
+            if league_id in self._entries:
+                logger.warning(f"Background refresh of league {league_id} failed, serving last good data: {e}")
+            raise
+
+        now = time.monotonic()
+        previous = self._entries.get(league_id)
+        entry = {
+            "data": data,
+            "loaded_at": now,
+            "attempted_at": now,
+            "requested_at": previous["requested_at"] if previous else now,
+        }
+        # A background refresh must not bring back a league dropped as idle
+        if previous is not None or not warm:
+            self._entries[league_id] = entry
+            self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_leagues:
+            oldest = min(self._entries, key=lambda k: self._entries[k]["requested_at"])
+            del self._entries[oldest]
@@ -0,0 +1,81 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(content: Any) -> str:
+    """
+    Compact JSON text, via orjson when installed.
+    """
+    if orjson is None:
+        return json.dumps(content, separators=(",", ":"))
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson when it is installed: several times
+    faster than the stdlib encoder on the odds and scenario payloads, and
+    NumPy values serialize natively. Falls back to JSONResponse otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+def state_etag(request: Request, league_data: Dict[str, Any]) -> str:
+    """
+    Validator for a response computed from a league state: a hash of the
+    whole league data plus the request path and query (without ?debug).
+    league_state_key alone would miss team names and the other display
+    fields the responses echo. Weak, since re-running the simulation for
+    the same state gives equivalent rather than byte-identical odds.
+    """
+    query = sorted((k, v) for k, v in request.query_params.multi_items() if k != "debug")
+    payload = {"league": league_data, "path": request.url.path, "query": query}
+    key = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return f'W/"{key[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match accepts `etag`, using the weak
+    comparison GET revalidation calls for.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+def cached_json(
+    request: Request,
+    content: Any,
+    cache_control: str,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    JSON response with caching headers, or 304 Not Modified when the
+    client already has it. Without `etag`, one is taken from the encoded
+    body. It is weak: GZipMiddleware sends the gzip and identity bodies
+    under the same tag, so they aren't byte-identical.
+    """
+    response = FastJSONResponse(content)
+    if etag is None:
+        etag = 'W/"' + hashlib.sha256(response.body).hexdigest()[:32] + '"'
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -2,12 +2,39 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional
 import logging
+import os
+from .fetch import fetch, fetch_all
+from .metrics import SCRAPES_IN_FLIGHT, timed
+from .parsers import LXML_AVAILABLE, parse_page_lxml, parse_score
+from .store import create_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://fantasy.nfl.com/league"
+# Overridable to point the scraper at a stand-in (see benchmarks/stub_server.py)
+BASE_URL = os.environ.get("NFL_BASE_URL", "https://fantasy.nfl.com/league").rstrip("/")
+
+# "lxml" (single pass, default when installed) or "bs4" (fallback)
+PARSER_BACKEND = os.environ.get("PARSER_BACKEND", "lxml" if LXML_AVAILABLE else "bs4")
+
+# Page cache TTLs in seconds (see schedule_page_ttl)
+LEAGUE_PAGE_TTL = 5 * 60
+CURRENT_WEEK_TTL = 5 * 60
+FUTURE_WEEK_TTL = 60 * 60
+
+# League snapshots persisted across restarts (LEAGUE_STORE_PATH), or None
+_store = create_store()
+
+def get_store():
+    return _store
+
+def set_store(store) -> None:
+    """
+    Swaps the snapshot store (a store.SnapshotStore, or None to disable it).
+    """
+    global _store
+    _store = store
 
 def get_headers() -> Dict[str, str]:
     """
@@ -19,6 +46,17 @@ def get_headers() -> Dict[str, str]:
         "Accept-Language": "en-US,en;q=0.9",
     }
 
+def schedule_page_ttl(week: int, current_week: int) -> Optional[float]:
+    """
+    Cache TTL for a week's page. Completed weeks never change, the current
+    week changes as games are scored, and future matchups rarely move.
+    """
+    if week < current_week:
+        return None
+    if week == current_week:
+        return CURRENT_WEEK_TTL
+    return FUTURE_WEEK_TTL
+
 def scrape_league(league_id: str) -> Dict[str, Any]:
     """
     Scrapes league data from NFL.com.
@@ -26,17 +64,129 @@ def scrape_league(league_id: str) -> Dict[str, Any]:
     if league_id == "mock":
         return get_mock_league_data(league_id)
 
+    return scrape_league_schedule(scrape_league_header(league_id))
+
+def scrape_league_header(league_id: str) -> Dict[str, Any]:
+    """
+    Scrapes the league home page only: name, standings and current week,
+    without the schedule. Lets callers show the league before the schedule
+    pages are in.
+    """
+    if league_id == "mock":
+        league = get_mock_league_data(league_id)
+        league["schedule"] = []
+        return league
+
     url = f"{BASE_URL}/{league_id}"
     logger.info(f"Fetching league data from {url}")
     
-    try:
-        response = requests.get(url, headers=get_headers(), timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch league page: {e}")
-        raise Exception(f"Failed to fetch league page: {e}")
-
-    soup = BeautifulSoup(response.content, "html.parser")
+    with SCRAPES_IN_FLIGHT.track():
+        try:
+            page = fetch(url, headers=get_headers(), ttl=LEAGUE_PAGE_TTL)
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch league page: {e}")
+            raise Exception(f"Failed to fetch league page: {e}")
+
+        league = page.parsed("league", lambda content: parse_league_page(content, league_id, page.url))
+
+    return {
+        "league_id": league_id,
+        "name": league["name"],
+        "teams": league["teams"],
+        "schedule": [],
+        "current_week": league["current_week"],
+        "total_weeks": 14, # Standard fantasy regular season
+        "playoff_spots": 6 # Placeholder
+    }
+
+def scrape_league_schedule(header: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Completes a league from scrape_league_header with its schedule.
+    """
+    if header["league_id"] == "mock":
+        return get_mock_league_data(header["league_id"])
+
+    with SCRAPES_IN_FLIGHT.track():
+        store = _store
+        if store is not None:
+            return refresh_league(store, header)
+
+        schedule = scrape_schedule(header["league_id"], header["current_week"], header["total_weeks"])
+        return {**header, "schedule": schedule}
+
+def weeks_to_refresh(stored: Dict[int, bool], current_week: int, total_weeks: int) -> List[int]:
+    """
+    Weeks whose pages must be fetched, given the stored week -> completed
+    flags: the current week always, completed weeks not yet stored as
+    completed (once, for their final scores), and future weeks not stored
+    at all (their matchups don't change).
+    """
+    weeks = []
+    for week in range(1, total_weeks + 1):
+        if week == current_week:
+            weeks.append(week)
+        elif week < current_week:
+            if not stored.get(week, False):
+                weeks.append(week)
+        elif week not in stored:
+            weeks.append(week)
+    return weeks
+
+def refresh_league(store, header: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Brings the league's stored snapshot up to date with a freshly scraped
+    header and returns it, schedule history included. Only the pages picked
+    by weeks_to_refresh are fetched; completed weeks are stored once.
+    """
+    league_id = header["league_id"]
+    current_week = header["current_week"]
+    store.save_header(header)
+
+    weeks = weeks_to_refresh(store.stored_weeks(league_id), current_week, header["total_weeks"])
+    urls = [f"{BASE_URL}/{league_id}?week={week}" for week in weeks]
+    # A week about to be stored as completed is never fetched again, so it
+    # is revalidated even if the cache still holds it from when it was the
+    # current week, with pre-final scores
+    ttls = [0 if week < current_week else schedule_page_ttl(week, current_week) for week in weeks]
+    logger.info(f"Refreshing weeks {weeks} of league {league_id}")
+
+    for week, page in zip(weeks, fetch_all(urls, headers=get_headers(), ttls=ttls)):
+        if isinstance(page, Exception):
+            logger.error(f"Failed to scrape schedule for week {week}: {page}")
+            continue
+        try:
+            matchups = page.parsed(
+                "schedule",
+                lambda content, week=week: parse_schedule_page(content, week),
+            )
+        except Exception as e:
+            logger.error(f"Failed to scrape schedule for week {week}: {e}")
+            continue
+        # An empty page is more likely a scrape failure than a bye week
+        if matchups:
+            store.save_week(league_id, week, matchups, completed=week < current_week)
+
+    return store.load_league(league_id)
+
+@timed("parse")
+def parse_league_page(content: bytes, league_id: str, final_url: str) -> Dict[str, Any]:
+    """
+    Parses the league home page into its name, standings and current week.
+    """
+    if PARSER_BACKEND == "lxml":
+        parsed = parse_page_lxml(content)
+        if parsed["access_issue"]:
+            if parsed["error_message"]:
+                raise Exception(f"League access error: {parsed['error_message']}")
+            if "signin" in final_url:
+                raise Exception("League is private. This tool only works with public leagues.")
+        return {
+            "name": parsed["name"] or f"League {league_id}",
+            "teams": parsed["teams"],
+            "current_week": parsed["current_week"] or 12, # Default
+        }
+
+    soup = BeautifulSoup(content, "html.parser")
     
     # Check if league is private or invalid
     if "League Not Found" in soup.text or "Private League" in soup.text: # This is a guess at the error message
@@ -45,7 +195,7 @@ def scrape_league(league_id: str) -> Dict[str, Any]:
         if error_msg:
              raise Exception(f"League access error: {error_msg.text.strip()}")
         # If we are redirected to login, that's a sign it's private
-        if "signin" in response.url:
+        if "signin" in final_url:
              raise Exception("League is private. This tool only works with public leagues.")
 
     league_name = soup.find("h1", class_="leagueName")
@@ -67,19 +217,11 @@ def scrape_league(league_id: str) -> Dict[str, Any]:
             current_week = int(week_li.text.replace("Week ", "").strip())
         except:
             pass
-            
-    total_weeks = 14 # Standard fantasy regular season
-    
-    schedule = scrape_schedule(league_id, current_week, total_weeks)
 
     return {
-        "league_id": league_id,
         "name": league_name,
         "teams": teams,
-        "schedule": schedule,
         "current_week": current_week,
-        "total_weeks": total_weeks,
-        "playoff_spots": 6 # Placeholder
     }
 
 def parse_standings(soup: BeautifulSoup) -> List[Dict[str, Any]]:
@@ -99,8 +241,6 @@ def parse_standings(soup: BeautifulSoup) -> List[Dict[str, Any]]:
             continue
             
         try:
-            logger.info(f"Found team row: {row.prettify()[:100]}...")
-            
             # Extract Team Name and ID
             team_link = row.find("a", class_="teamName")
             if not team_link:
@@ -180,10 +320,17 @@ def parse_standings(soup: BeautifulSoup) -> List[Dict[str, Any]]:
     
     # Now extract logos from the page
     # Look for <a class="teamImg teamId-X"> tags which contain the team logos
+    # Index them once instead of searching the whole page for every team
+    logo_links = {}
+    for link in soup.find_all("a", class_="teamImg"):
+        classes = link.get("class", [])
+        if len(classes) == 2 and classes[0] == "teamImg" and classes[1].startswith("teamId-"):
+            logo_links.setdefault(classes[1][len("teamId-"):], link)
+
     for team in teams:
         team_id = team["id"]
         # Find the teamImg link for this team
-        team_img_link = soup.find("a", class_=f"teamImg teamId-{team_id}")
+        team_img_link = logo_links.get(team_id)
         if team_img_link:
             img_tag = team_img_link.find("img")
             if img_tag and img_tag.get('src'):
@@ -199,77 +346,103 @@ def parse_standings(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 def scrape_schedule(league_id: str, current_week: int, total_weeks: int = 14) -> List[Dict[str, Any]]:
     """
     Scrapes the schedule for remaining weeks.
+    All week pages are fetched concurrently over the shared connection pool
+    and served from the page cache while fresh.
     """
     schedule = []
     
     # We only need to scrape future weeks for the simulation
     # But for completeness, we could scrape all. 
     # For performance, let's just do current_week to total_weeks.
+    weeks = list(range(current_week, total_weeks + 1))
+    urls = [f"{BASE_URL}/{league_id}?week={week}" for week in weeks]
+    logger.info(f"Fetching schedule for weeks {current_week}-{total_weeks} of league {league_id}")
     
-    for week in range(current_week, total_weeks + 1):
-        url = f"{BASE_URL}/{league_id}?week={week}"
-        logger.info(f"Fetching schedule for week {week} from {url}")
-        
+    ttls = [schedule_page_ttl(week, current_week) for week in weeks]
+    
+    for week, page in zip(weeks, fetch_all(urls, headers=get_headers(), ttls=ttls)):
+        if isinstance(page, Exception):
+            logger.error(f"Failed to scrape schedule for week {week}: {page}")
+            continue
         try:
-            response = requests.get(url, headers=get_headers(), timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Find the score strip or matchup list
-            # It seems to be in a ul with class 'ss'
-            matchup_list = soup.find("ul", class_="ss")
-            if not matchup_list:
-                logger.warning(f"No matchup list found for week {week}")
-                continue
-                
-            matchups = matchup_list.find_all("li")
-            for match in matchups:
-                # Each li contains a link with title "Team A vs. Team B"
-                link = match.find("a")
-                if not link: continue
-                
-                title = link.get("title", "") # "Team A vs. Team B"
-                if " vs. " not in title: continue
-                
-                # Extract team IDs from the inner divs
-                # <div class="first"><em>Name</em> <span class="teamTotal teamId-11">...</span></div>
-                first_div = link.find("div", class_="first")
-                last_div = link.find("div", class_="last")
-                
-                if not first_div or not last_div: continue
-                
-                team1_span = first_div.find("span", class_="teamTotal")
-                team2_span = last_div.find("span", class_="teamTotal")
-                
-                if not team1_span or not team2_span: continue
-                
-                # class="teamTotal teamId-11" -> extract 11
-                team1_id = ""
-                for cls in team1_span.get("class", []):
-                    if cls.startswith("teamId-"):
-                        team1_id = cls.split("-")[1]
-                        break
-                        
-                team2_id = ""
-                for cls in team2_span.get("class", []):
-                    if cls.startswith("teamId-"):
-                        team2_id = cls.split("-")[1]
-                        break
-                
-                if team1_id and team2_id:
-                    schedule.append({
-                        "week": week,
-                        "team1_id": team1_id,
-                        "team2_id": team2_id,
-                        "completed": False # Future games are not completed
-                    })
-                    
+            schedule.extend(page.parsed(
+                "schedule",
+                lambda content, week=week: parse_schedule_page(content, week),
+            ))
         except Exception as e:
             logger.error(f"Failed to scrape schedule for week {week}: {e}")
             continue
             
     return schedule
 
+@timed("parse")
+def parse_schedule_page(content: bytes, week: int) -> List[Dict[str, Any]]:
+    """
+    Parses one week's page with the configured parser backend.
+    """
+    if PARSER_BACKEND == "lxml":
+        return parse_page_lxml(content, week)["schedule"]
+    return parse_schedule(BeautifulSoup(content, "html.parser"), week)
+
+def parse_schedule(soup: BeautifulSoup, week: int) -> List[Dict[str, Any]]:
+    """
+    Parses the matchups for one week from its score strip.
+    """
+    schedule = []
+    
+    # Find the score strip or matchup list
+    # It seems to be in a ul with class 'ss'
+    matchup_list = soup.find("ul", class_="ss")
+    if not matchup_list:
+        logger.warning(f"No matchup list found for week {week}")
+        return schedule
+        
+    matchups = matchup_list.find_all("li")
+    for match in matchups:
+        # Each li contains a link with title "Team A vs. Team B"
+        link = match.find("a")
+        if not link: continue
+        
+        title = link.get("title", "") # "Team A vs. Team B"
+        if " vs. " not in title: continue
+        
+        # Extract team IDs from the inner divs
+        # <div class="first"><em>Name</em> <span class="teamTotal teamId-11">...</span></div>
+        first_div = link.find("div", class_="first")
+        last_div = link.find("div", class_="last")
+        
+        if not first_div or not last_div: continue
+        
+        team1_span = first_div.find("span", class_="teamTotal")
+        team2_span = last_div.find("span", class_="teamTotal")
+        
+        if not team1_span or not team2_span: continue
+        
+        # class="teamTotal teamId-11" -> extract 11
+        team1_id = ""
+        for cls in team1_span.get("class", []):
+            if cls.startswith("teamId-"):
+                team1_id = cls.split("-")[1]
+                break
+                
+        team2_id = ""
+        for cls in team2_span.get("class", []):
+            if cls.startswith("teamId-"):
+                team2_id = cls.split("-")[1]
+                break
+        
+        if team1_id and team2_id:
+            schedule.append({
+                "week": week,
+                "team1_id": team1_id,
+                "team2_id": team2_id,
+                "team1_score": parse_score(team1_span.get_text()),
+                "team2_score": parse_score(team2_span.get_text()),
+                "completed": False # Future games are not completed
+            })
+            
+    return schedule
+
 def get_mock_league_data(league_id: str) -> Dict[str, Any]:
     """
     Returns mock league data for testing and development.
@@ -0,0 +1,657 @@
+import time
+import numpy as np
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .metrics import span
+
+# Schedules with at most this many remaining games are solved exactly by
+# enumerating every outcome instead of sampling. Enumeration doubles with
+# every game while adaptive sampling stays flat, and the two cost about the
+# same at 13-14 games; 12 keeps the exact path the faster one.
+EXACT_MAX_GAMES = 12
+
+# Adaptive sampling runs simulations in batches of this size
+BATCH_SIZE = 5000
+Z_95 = 1.959964
+
+# Cap on the rows an exact seed distribution ranks (outcome rows x side
+# game results, see exact_seed_histogram)
+SEED_MAX_ROWS = 1 << 16
+
+def pf_win_probability(t1_points_for: float, t2_points_for: float) -> float:
+    """
+    Probability that team 1 beats team 2, weighted by season Points For.
+    """
+    # Add a small epsilon to avoid division by zero
+    total_pf = t1_points_for + t2_points_for + 1.0
+    return (t1_points_for + 0.5) / total_pf
+
+def tiebreak_ranks(points_for: List[float]) -> List[int]:
+    """
+    Static tiebreak rank per team, higher is better: Points For (desc), then
+    original order. Matches a stable sort on (wins, points_for) with
+    reverse=True, so ranking by (wins, tiebreak) gives a strict total order.
+    """
+    num_teams = len(points_for)
+    order = sorted(range(num_teams), key=lambda i: (-points_for[i], i))
+    ranks = [0] * num_teams
+    for position, i in enumerate(order):
+        ranks[i] = num_teams - 1 - position
+    return ranks
+
+def make_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Returns a NumPy random generator. Passing the same seed reproduces a run.
+    """
+    return np.random.default_rng(seed)
+
+def build_game_arrays(
+    teams: List[Dict[str, Any]],
+    schedule: List[Dict[str, Any]],
+    decided: Optional[Dict[str, bool]] = None,
+) -> Dict[str, Any]:
+    """
+    Converts teams and the remaining schedule into flat arrays for the engine.
+
+    Team ids are mapped to their index in `teams`. Only games that are not
+    completed and reference two known teams are kept.
+
+    `decided` maps team ids whose playoff status is already known to True
+    (clinched) or False (eliminated). Those teams are left out of the
+    ranking, and games between two decided teams are dropped since they
+    cannot change anyone's playoff status. Those games can still change
+    seeding, so they are kept apart as "side" games that only the standings
+    pass simulates (see side_wins).
+    """
+    decided = decided or {}
+    team_index = {t["id"]: i for i, t in enumerate(teams)}
+    num_teams = len(teams)
+
+    base_wins = np.array([t["wins"] for t in teams], dtype=np.int64)
+    points_for = np.array([t["points_for"] for t in teams], dtype=np.float64)
+
+    games = []
+    side_games = []
+    game_keys = []
+    game_weeks = []
+    for game in schedule:
+        if game.get("completed", False):
+            continue
+        t1 = team_index.get(game["team1_id"])
+        t2 = team_index.get(game["team2_id"])
+        if t1 is None or t2 is None:
+            continue
+        if game["team1_id"] in decided and game["team2_id"] in decided:
+            side_games.append((t1, t2))
+            continue
+        games.append((t1, t2))
+        game_keys.append(f"{game['week']}-{game['team1_id']}-{game['team2_id']}")
+        game_weeks.append(game["week"])
+
+    team1_idx = np.array([g[0] for g in games], dtype=np.int64)
+    team2_idx = np.array([g[1] for g in games], dtype=np.int64)
+    t1_prob = pf_win_probability(points_for[team1_idx], points_for[team2_idx])
+    incidence, team2_baseline = game_incidence(team1_idx, team2_idx, num_teams)
+
+    side_team1_idx = np.array([g[0] for g in side_games], dtype=np.int64)
+    side_team2_idx = np.array([g[1] for g in side_games], dtype=np.int64)
+    side_t1_prob = pf_win_probability(points_for[side_team1_idx], points_for[side_team2_idx])
+    side_incidence, side_team2_baseline = game_incidence(side_team1_idx, side_team2_idx, num_teams)
+
+    tiebreak = np.array(tiebreak_ranks([t["points_for"] for t in teams]), dtype=np.int64)
+
+    active = np.array([i for i, t in enumerate(teams) if t["id"] not in decided], dtype=np.int64)
+    clinched = np.array([decided.get(t["id"]) is True for t in teams], dtype=bool)
+
+    return {
+        "team_ids": [t["id"] for t in teams],
+        "active": active,
+        "clinched": clinched,
+        "game_keys": game_keys,
+        "game_weeks": game_weeks,
+        "base_wins": base_wins,
+        "points_for": points_for,
+        "team1_idx": team1_idx,
+        "team2_idx": team2_idx,
+        "t1_prob": t1_prob,
+        "incidence": incidence,
+        "team2_baseline": team2_baseline,
+        "tiebreak": tiebreak,
+        "side_t1_prob": side_t1_prob,
+        "side_incidence": side_incidence,
+        "side_team2_baseline": side_team2_baseline,
+    }
+
+def game_incidence(team1_idx: np.ndarray, team2_idx: np.ndarray, num_teams: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Game -> team incidence (+1 for team1, -1 for team2) and each team's
+    wins if team 2 won every game, so that
+    wins = base + team2_baseline + outcomes @ incidence.
+    """
+    num_games = len(team1_idx)
+    incidence = np.zeros((num_games, num_teams), dtype=np.float64)
+    incidence[np.arange(num_games), team1_idx] += 1.0
+    incidence[np.arange(num_games), team2_idx] -= 1.0
+    return incidence, np.bincount(team2_idx, minlength=num_teams)
+
+def simulate_outcomes(arrays: Dict[str, Any], simulations: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws every remaining game for every simulation at once.
+    Returns a (simulations x games) boolean matrix, True where team 1 won.
+    """
+    return rng.random((simulations, len(arrays["t1_prob"]))) < arrays["t1_prob"]
+
+def enumerate_outcomes(arrays: Dict[str, Any]) -> np.ndarray:
+    """
+    Every possible result of the remaining games, one row per bitmask.
+    Returns a (2^games x games) boolean matrix, True where team 1 won.
+    """
+    num_games = len(arrays["t1_prob"])
+    masks = np.arange(1 << num_games, dtype=np.int64)
+    return ((masks[:, None] >> np.arange(num_games)) & 1).astype(bool)
+
+def outcome_weights(arrays: Dict[str, Any], outcomes: np.ndarray) -> np.ndarray:
+    """
+    Probability of each outcome row under the PF-based win probabilities.
+    """
+    p = arrays["t1_prob"]
+    # Product of per-game probabilities, taken in log space as one product
+    log_odds = np.log(p) - np.log1p(-p)
+    return np.exp(outcomes.astype(np.float64) @ log_odds + np.log1p(-p).sum())
+
+def final_wins(arrays: Dict[str, Any], outcomes: np.ndarray) -> np.ndarray:
+    """
+    Final win totals per simulation as a (simulations x teams) matrix.
+    """
+    base = arrays["base_wins"] + arrays["team2_baseline"]
+    delta = outcomes.astype(np.float64) @ arrays["incidence"]
+    return base + delta.astype(np.int64)
+
+def side_arrays(arrays: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The side games (between two decided teams) in the shape
+    simulate_outcomes, enumerate_outcomes and outcome_weights expect.
+    """
+    return {"t1_prob": arrays["side_t1_prob"]}
+
+def side_wins(arrays: Dict[str, Any], side_outcomes: np.ndarray) -> np.ndarray:
+    """
+    Wins each team takes from the side games, per row of side outcomes.
+    Added to final_wins for the standings pass only.
+    """
+    delta = side_outcomes.astype(np.float64) @ arrays["side_incidence"]
+    return arrays["side_team2_baseline"] + delta.astype(np.int64)
+
+def rank_keys(arrays: Dict[str, Any], wins: np.ndarray) -> np.ndarray:
+    """
+    Packed sort key per simulation and undecided team: Wins, then the
+    static Points For tiebreak, in one int32. Higher is better, and keys
+    are unique within a row since the tiebreak is.
+    """
+    num_teams = len(arrays["team_ids"])
+    active = arrays["active"]
+    return (wins[:, active] * num_teams + arrays["tiebreak"][active]).astype(np.int32)
+
+def rank_teams(arrays: Dict[str, Any], wins: np.ndarray, top_k: int) -> Dict[str, np.ndarray]:
+    """
+    Ranks the undecided teams by Wins (desc), then Points For (desc), for a
+    whole batch of simulations at once.
+
+    "top" is a (simulations x teams) boolean matrix marking the `top_k`
+    best undecided teams of each row. It comes from a partial selection
+    (the k-th best key per row) rather than a full sort.
+    """
+    num_sims = wins.shape[0]
+    num_teams = len(arrays["team_ids"])
+    active = arrays["active"]
+    keys = rank_keys(arrays, wins)
+
+    top = np.zeros((num_sims, num_teams), dtype=bool)
+    top_k = min(top_k, len(active))
+    if top_k > 0:
+        cut = len(active) - top_k
+        kth = np.partition(keys, cut, axis=1)[:, cut:cut + 1]
+        top[:, active] = keys >= kth
+    return {"top": top}
+
+def standing_keys(arrays: Dict[str, Any], wins: np.ndarray) -> np.ndarray:
+    """
+    Sort key per simulation over every team, decided ones included: Wins in
+    the high bits and the tiebreak rank in the low byte, as int32. Extra
+    wins w can be added to a key as w << 8. Supports up to 256 teams.
+    """
+    return (wins.astype(np.int32) << 8) | arrays["tiebreak"].astype(np.int32)
+
+def add_side_wins(arrays: Dict[str, Any], keys: np.ndarray, side_outcomes: np.ndarray) -> None:
+    """
+    Adds the side game wins (one row of side results per row of keys) to
+    standing_keys in place. Same sums as side_wins, in float32: they are
+    small whole numbers, and the product runs twice as fast.
+    """
+    delta = side_outcomes.astype(np.float32) @ arrays["side_incidence"].astype(np.float32)
+    side = delta.astype(np.int32)
+    side += arrays["side_team2_baseline"].astype(np.int32)
+    side <<= 8
+    keys += side
+
+def rank_standings(
+    arrays: Dict[str, Any],
+    wins: np.ndarray,
+    top_k: int,
+    side_outcomes: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    rank_teams plus the full final standings, side games included, from a
+    single sort of standing_keys.
+
+    "standings" holds the tiebreak rank per place, last place first (see
+    final_standings). "top" marks the `top_k` best undecided teams of each
+    row: those at or above the k-th best undecided key, read off the
+    sorted row. Side games only involve decided teams, so they don't
+    change how the undecided teams order among themselves.
+    """
+    num_sims, num_teams = wins.shape
+    keys = standing_keys(arrays, wins)
+    add_side_wins(arrays, keys, side_outcomes)
+    ordered = np.sort(keys, axis=1)
+    standings = ordered.astype(np.uint8)
+
+    is_active = np.zeros(num_teams, dtype=bool)
+    is_active[arrays["active"]] = True
+    top_k = min(top_k, len(arrays["active"]))
+    if top_k == 0:
+        return {"top": np.zeros((num_sims, num_teams), dtype=bool), "standings": standings}
+
+    # The k-th best undecided key sits `above` places below the k-th best
+    # key overall, where `above` counts the decided teams ahead of it.
+    # Counting decided teams at or above the current guess only ever moves
+    # it down, and stops at the right place within one step per decided team.
+    decided_keys = keys[:, ~is_active]
+    rows = np.arange(num_sims)
+    above = np.zeros(num_sims, dtype=np.int64)
+    while True:
+        kth = ordered[rows, num_teams - top_k - above]
+        counted = (decided_keys >= kth[:, None]).sum(axis=1)
+        if np.array_equal(counted, above):
+            break
+        above = counted
+    return {"top": (keys >= kth[:, None]) & is_active, "standings": standings}
+
+def final_standings(keys: np.ndarray) -> np.ndarray:
+    """
+    Full finishing order per row of standing_keys (sorted in place): the
+    teams' tiebreak ranks from last place to first, as uint8. The tiebreak
+    ranks are a permutation of the teams, so the low byte of each sorted
+    key identifies its team and a plain value sort, much cheaper than
+    argsort, is enough. seed_histogram maps the ranks back to teams.
+    """
+    keys.sort(axis=1)
+    return keys.astype(np.uint8)
+
+def seed_histogram(
+    arrays: Dict[str, Any],
+    standings: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    (teams x places) histogram of a block of final_standings rows: how many
+    rows, or with `weights` how much weight, put each team in each place,
+    first place first. Integer counts without weights.
+    """
+    num_teams = standings.shape[1]
+    counts = np.zeros((num_teams, num_teams), dtype=np.int64 if weights is None else np.float64)
+    for place in range(num_teams):
+        counts[:, place] = np.bincount(standings[:, place], weights, minlength=num_teams)
+    # Rows are tiebreak ranks and columns run from last place to first
+    return counts[arrays["tiebreak"], ::-1]
+
+def seed_half_width(effective_samples: float, z: float = Z_95) -> float:
+    """
+    Conservative 95% confidence half-width of a seed probability estimated
+    from `effective_samples` independent draws: the binomial bound at
+    p = 1/2, so it holds for every team and place.
+    """
+    return z * 0.5 / np.sqrt(effective_samples)
+
+def exact_seed_histogram(
+    arrays: Dict[str, Any],
+    wins: np.ndarray,
+    weights: np.ndarray,
+    seed: Optional[int] = None,
+    chunk_rows: int = 65536,
+) -> Tuple[np.ndarray, float]:
+    """
+    Seed probabilities (teams x places) over every enumerated outcome row,
+    given the rows' final_wins and weights, and their 95% half-width (see
+    seed_half_width). Each row is crossed with every result of the side
+    games, weighted by both probabilities, so the distribution stays exact
+    and the half-width is zero. If that cross product would exceed
+    SEED_MAX_ROWS, each row draws its own sample of side results instead,
+    splitting its weight evenly between them.
+    """
+    num_teams = len(arrays["team_ids"])
+    if num_teams == 0:
+        return np.zeros((0, 0)), 0.0
+    side = side_arrays(arrays)
+    num_side = len(side["t1_prob"])
+    if len(wins) << num_side <= SEED_MAX_ROWS:
+        side_outcomes = enumerate_outcomes(side)
+        side_weights = outcome_weights(side, side_outcomes)
+        extra_keys = (side_wins(arrays, side_outcomes).astype(np.int32) << 8)[:, None, :]
+        half_width = 0.0
+    else:
+        samples = max(SEED_MAX_ROWS // len(wins), 1)
+        side_outcomes = simulate_outcomes(side, samples * len(wins), make_rng(seed))
+        side_weights = np.full(samples, 1.0 / samples)
+        extra_keys = (side_wins(arrays, side_outcomes).astype(np.int32) << 8).reshape(samples, len(wins), num_teams)
+        # Kish effective sample size of the (row, sample) weights
+        half_width = seed_half_width(samples / np.sum(weights ** 2))
+
+    keys = standing_keys(arrays, wins)
+    histogram = np.zeros((num_teams, num_teams), dtype=np.float64)
+    step = max(chunk_rows // len(wins), 1)
+    for start in range(0, len(extra_keys), step):
+        block = keys[None, :, :] + extra_keys[start:start + step]
+        block_weights = side_weights[start:start + step, None] * weights[None, :]
+        standings = final_standings(block.reshape(-1, num_teams))
+        histogram += seed_histogram(arrays, standings, block_weights.ravel())
+    return histogram, half_width
+
+def expected_wins(arrays: Dict[str, Any]) -> np.ndarray:
+    """
+    Expected final win total per team, side games included. Wins are linear
+    in the game outcomes, so this is exact without sampling.
+    """
+    return (
+        arrays["base_wins"] + arrays["team2_baseline"] + arrays["t1_prob"] @ arrays["incidence"]
+        + arrays["side_team2_baseline"] + arrays["side_t1_prob"] @ arrays["side_incidence"]
+    )
+
+def playoff_mask(arrays: Dict[str, Any], ranking: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    (simulations x teams) boolean matrix, True where the team made the
+    playoffs: clinched teams plus the undecided teams ranked into the open
+    spots (see rank_teams).
+    """
+    return ranking["top"] | arrays["clinched"]
+
+def open_spots(arrays: Dict[str, Any], playoff_spots: int) -> int:
+    """
+    Playoff spots left for undecided teams once clinched teams take theirs.
+    """
+    return max(playoff_spots - int(arrays["clinched"].sum()), 0)
+
+def pack_outcomes(outcomes: np.ndarray) -> np.ndarray:
+    """
+    Bit-packs a (rows x games) boolean outcome matrix to one bit per game.
+    """
+    return np.packbits(outcomes, axis=1)
+
+def unpack_outcomes(outcome_bits: np.ndarray, num_games: int) -> np.ndarray:
+    """
+    Inverse of pack_outcomes.
+    """
+    return np.unpackbits(outcome_bits, axis=1, count=num_games).astype(bool)
+
+def outcome_column(outcome_bits: np.ndarray, game: int) -> np.ndarray:
+    """
+    One game's column of a packed outcome matrix, True where team 1 won.
+    """
+    return (outcome_bits[:, game >> 3] >> (7 - (game & 7))) & 1 == 1
+
+def matching_rows(outcome_bits: np.ndarray, locked: Dict[int, bool]) -> np.ndarray:
+    """
+    Boolean row mask of a packed outcome matrix: True where every locked
+    game (column -> team 1 won) went the locked way. Only the locked
+    columns are unpacked.
+    """
+    mask = np.ones(outcome_bits.shape[0], dtype=bool)
+    for game, team1_won in locked.items():
+        mask &= outcome_column(outcome_bits, game) == team1_won
+    return mask
+
+def pin_games(arrays: Dict[str, Any], locked: Dict[int, bool]) -> Dict[str, Any]:
+    """
+    Engine arrays with the `locked` games (column -> team 1 won) decided:
+    their team 1 win probability is pinned to 1 or 0. Sampled rows keep
+    every column, so they line up with an unlocked run's rows and always
+    pass matching_rows.
+    """
+    t1_prob = arrays["t1_prob"].copy()
+    for game, team1_won in locked.items():
+        t1_prob[game] = 1.0 if team1_won else 0.0
+    return {**arrays, "t1_prob": t1_prob}
+
+def weighted_outcome_sums(
+    outcome_bits: np.ndarray,
+    num_games: int,
+    made: np.ndarray,
+    weights: np.ndarray,
+    chunk_rows: int = 65536,
+) -> np.ndarray:
+    """
+    For every team and game, the total weight of rows in which the team made
+    the playoffs and team 1 won the game. Returns a (teams x games) matrix.
+
+    Rows are unpacked a chunk at a time so the full boolean matrix is never
+    materialized.
+    """
+    totals = np.zeros((made.shape[1], num_games), dtype=np.float64)
+    for start in range(0, outcome_bits.shape[0], chunk_rows):
+        stop = start + chunk_rows
+        block = unpack_outcomes(outcome_bits[start:stop], num_games).astype(np.float64)
+        row_weights = made[start:stop] * weights[start:stop, None]
+        totals += row_weights.T @ block
+    return totals
+
+def resolve_outcomes(
+    arrays: Dict[str, Any],
+    outcomes: np.ndarray,
+    playoff_spots: int,
+    side_outcomes: Optional[np.ndarray] = None,
+    wins: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Playoff field for a block of outcome rows, and with `side_outcomes`
+    (one row of side game results per outcome row) the final standings.
+    Pass the rows' final_wins as `wins` if already computed.
+    """
+    with span("rank"):
+        if wins is None:
+            wins = final_wins(arrays, outcomes)
+        spots = open_spots(arrays, playoff_spots)
+        if side_outcomes is None:
+            ranking = rank_teams(arrays, wins, spots)
+        else:
+            ranking = rank_standings(arrays, wins, spots, side_outcomes)
+        made = playoff_mask(arrays, ranking)
+    result = {
+        # One bit per game, see pack_outcomes
+        "outcome_bits": pack_outcomes(outcomes),
+        "made": made,
+    }
+    if side_outcomes is not None:
+        # Tiebreak rank per place, last place first; see final_standings
+        result["standings"] = ranking["standings"]
+    return result
+
+def iter_simulation_batches(
+    arrays: Dict[str, Any],
+    playoff_spots: int,
+    batch_size: int,
+    rng: np.random.Generator,
+    positions: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Endless stream of simulation batches drawn from the same prepared arrays.
+    """
+    while True:
+        with span("simulate"):
+            outcomes = simulate_outcomes(arrays, batch_size, rng)
+            side_outcomes = simulate_outcomes(side_arrays(arrays), batch_size, rng) if positions else None
+        yield resolve_outcomes(arrays, outcomes, playoff_spots, side_outcomes)
+
+def wilson_half_width(successes: np.ndarray, n: int, z: float = Z_95) -> np.ndarray:
+    """
+    Half-width of the Wilson score interval for a binomial proportion.
+    """
+    if n == 0:
+        return np.full(np.shape(successes), 0.5)
+    p = np.asarray(successes, dtype=np.float64) / n
+    return z * np.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / (1.0 + z * z / n)
+
+def _merge_batches(batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {key: np.concatenate([b[key] for b in batches]) for key in batches[0]}
+
+def iter_adaptive(
+    arrays: Dict[str, Any],
+    batches: Iterator[Dict[str, Any]],
+    max_simulations: int,
+    target_width: float,
+    time_budget: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Consumes `batches` until every undecided team's 95% confidence interval
+    on its playoff probability is narrower than `target_width`, or until
+    `max_simulations` runs or `time_budget` seconds are used up.
+
+    Yields a progress snapshot after every batch: the batch itself, the
+    running simulation count and per-team playoff counts, and `stop_reason`
+    once sampling is finished.
+    """
+    active = arrays["active"]
+    started = time.monotonic()
+    successes = np.zeros(len(arrays["team_ids"]), dtype=np.int64)
+    n = 0
+
+    for batch in batches:
+        take = min(len(batch["made"]), max_simulations - n)
+        batch = {key: value[:take] for key, value in batch.items()}
+        successes += batch["made"].sum(axis=0)
+        n += take
+
+        stop_reason = None
+        widths = 2 * wilson_half_width(successes[active], n)
+        if len(active) == 0 or widths.max() <= target_width:
+            stop_reason = "precision"
+        elif n >= max_simulations:
+            stop_reason = "max_simulations"
+        elif time_budget is not None and time.monotonic() - started >= time_budget:
+            stop_reason = "time_budget"
+
+        yield {"batch": batch, "simulations": n, "successes": successes.copy(), "stop_reason": stop_reason}
+        if stop_reason is not None:
+            return
+
+def iter_simulate_league(
+    arrays: Dict[str, Any],
+    playoff_spots: int,
+    simulations: int,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    workers: int = 1,
+    positions: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generator form of simulate_league. Adaptive sampling yields a progress
+    snapshot (`final` False, with running `simulations` and per-team
+    `successes`) after every batch; the last item is the full result with
+    `final` True.
+
+    With `positions`, each batch's standings are reduced into an integer
+    (teams x places) histogram as they arrive, and the result carries
+    "seeds", the probability of each team finishing in each place, and
+    "seed_half_width", their 95% half-width (zero when fully enumerated).
+    """
+    num_games = len(arrays["t1_prob"])
+    exact = num_games <= exact_max_games
+    if exact:
+        with span("simulate"):
+            outcomes = enumerate_outcomes(arrays)
+            weights = outcome_weights(arrays, outcomes)
+        with span("rank"):
+            wins = final_wins(arrays, outcomes)
+        if positions and len(arrays["side_t1_prob"]) == 0:
+            # Nothing to cross with: the playoff ranking's sort gives the standings
+            no_side_games = np.zeros((len(outcomes), 0), dtype=bool)
+            result = resolve_outcomes(arrays, outcomes, playoff_spots, no_side_games, wins=wins)
+            with span("rank"):
+                result["seeds"] = seed_histogram(arrays, result.pop("standings"), weights)
+            result["seed_half_width"] = 0.0
+        else:
+            result = resolve_outcomes(arrays, outcomes, playoff_spots, wins=wins)
+            if positions:
+                with span("rank"):
+                    result["seeds"], result["seed_half_width"] = exact_seed_histogram(arrays, wins, weights, seed)
+        result["weights"] = weights
+        result["stop_reason"] = "exact"
+    else:
+        batch_size = BATCH_SIZE * workers if target_width is not None else simulations
+        if workers > 1:
+            from .parallel import iter_parallel_batches
+            batches = iter_parallel_batches(arrays, playoff_spots, batch_size, seed, workers, positions)
+        else:
+            batches = iter_simulation_batches(arrays, playoff_spots, batch_size, make_rng(seed), positions)
+        try:
+            seed_counts = 0
+            if target_width is not None:
+                taken = []
+                for progress in iter_adaptive(arrays, batches, simulations, target_width, time_budget):
+                    batch = progress.pop("batch")
+                    if positions:
+                        seed_counts = seed_counts + seed_histogram(arrays, batch.pop("standings"))
+                    taken.append(batch)
+                    if progress["stop_reason"] is None:
+                        progress["final"] = False
+                        yield progress
+                result = _merge_batches(taken)
+                result["weights"] = np.full(progress["simulations"], 1.0 / progress["simulations"])
+                result["stop_reason"] = progress["stop_reason"]
+            else:
+                result = next(batches)
+                if positions:
+                    seed_counts = seed_histogram(arrays, result.pop("standings"))
+                result["weights"] = np.full(simulations, 1.0 / simulations)
+                result["stop_reason"] = "fixed"
+            if positions:
+                result["seeds"] = seed_counts / len(result["weights"])
+                result["seed_half_width"] = seed_half_width(len(result["weights"]))
+        finally:
+            batches.close()
+
+    result["exact"] = exact
+    result["num_games"] = num_games
+    result["simulations"] = len(result["weights"])
+    result["final"] = True
+    yield result
+
+def simulate_league(
+    arrays: Dict[str, Any],
+    playoff_spots: int,
+    simulations: int,
+    seed: Optional[int] = None,
+    exact_max_games: int = EXACT_MAX_GAMES,
+    target_width: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    workers: int = 1,
+    positions: bool = False,
+) -> Dict[str, Any]:
+    """
+    Resolves the remaining schedule and the resulting standings and
+    playoff field.
+
+    Small schedules (at most `exact_max_games` games) are enumerated exactly
+    and each outcome is weighted by its probability. Larger schedules are
+    sampled with equally weighted runs: exactly `simulations` of them, or,
+    when `target_width` is given, adaptively with `simulations` as the
+    upper bound (see iter_adaptive). With `workers` > 1 sampling is
+    sharded across a process pool (see parallel.iter_parallel_batches).
+    With `positions` the result also holds the seed distribution (see
+    iter_simulate_league).
+    """
+    for result in iter_simulate_league(
+        arrays, playoff_spots, simulations, seed, exact_max_games, target_width, time_budget, workers, positions
+    ):
+        pass
+    return result
@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leagues (
+    league_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    current_week INTEGER NOT NULL,
+    total_weeks INTEGER NOT NULL,
+    playoff_spots INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    league_id TEXT NOT NULL,
+    team_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (league_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    league_id TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (league_id, week)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    league_id TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    team1_id TEXT NOT NULL,
+    team2_id TEXT NOT NULL,
+    team1_score REAL,
+    team2_score REAL,
+    PRIMARY KEY (league_id, week, position)
+);
+"""
+
+class SnapshotStore:
+    """
+    SQLite store of league snapshots: the league header and standings plus
+    every stored week's matchups and scores, keyed by league and week.
+
+    A week is saved with a `completed` flag. Completed weeks are final and
+    never need fetching again; the others are overwritten on refresh.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def load_league(self, league_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored snapshot in scrape_league's format, or None if the league
+        has never been saved.
+        """
+        with self._lock:
+            league = self._conn.execute(
+                "SELECT * FROM leagues WHERE league_id = ?", (league_id,)
+            ).fetchone()
+            if league is None:
+                return None
+            teams = self._conn.execute(
+                "SELECT data FROM teams WHERE league_id = ? ORDER BY position", (league_id,)
+            ).fetchall()
+        return {
+            "league_id": league_id,
+            "name": league["name"],
+            "teams": [json.loads(row["data"]) for row in teams],
+            "schedule": self.load_schedule(league_id),
+            "current_week": league["current_week"],
+            "total_weeks": league["total_weeks"],
+            "playoff_spots": league["playoff_spots"],
+        }
+
+    def load_schedule(self, league_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT m.week, m.team1_id, m.team2_id, m.team1_score, m.team2_score, w.completed
+                FROM matchups m JOIN weeks w ON w.league_id = m.league_id AND w.week = m.week
+                WHERE m.league_id = ? ORDER BY m.week, m.position
+                """,
+                (league_id,),
+            ).fetchall()
+        return [
+            {
+                "week": row["week"],
+                "team1_id": row["team1_id"],
+                "team2_id": row["team2_id"],
+                "team1_score": row["team1_score"],
+                "team2_score": row["team2_score"],
+                "completed": bool(row["completed"]),
+            }
+            for row in rows
+        ]
+
+    def stored_weeks(self, league_id: str) -> Dict[int, bool]:
+        """
+        Week -> completed flag for every week stored for the league.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT week, completed FROM weeks WHERE league_id = ?", (league_id,)
+            ).fetchall()
+        return {row["week"]: bool(row["completed"]) for row in rows}
+
+    def save_header(self, league: Dict[str, Any]) -> None:
+        """
+        Saves the league row and replaces its standings.
+        """
+        league_id = league["league_id"]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO leagues VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    league_id,
+                    league["name"],
+                    league["current_week"],
+                    league["total_weeks"],
+                    league["playoff_spots"],
+                    time.time(),
+                ),
+            )
+            self._conn.execute("DELETE FROM teams WHERE league_id = ?", (league_id,))
+            self._conn.executemany(
+                "INSERT INTO teams VALUES (?, ?, ?, ?)",
+                [(league_id, team["id"], i, json.dumps(team)) for i, team in enumerate(league["teams"])],
+            )
+
+    def save_week(self, league_id: str, week: int, matchups: List[Dict[str, Any]], completed: bool) -> None:
+        """
+        Replaces one week's matchups.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO weeks VALUES (?, ?, ?, ?)",
+                (league_id, week, int(completed), time.time()),
+            )
+            self._conn.execute("DELETE FROM matchups WHERE league_id = ? AND week = ?", (league_id, week))
+            self._conn.executemany(
+                "INSERT INTO matchups VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        league_id,
+                        week,
+                        i,
+                        game["team1_id"],
+                        game["team2_id"],
+                        game.get("team1_score"),
+                        game.get("team2_score"),
+                    )
+                    for i, game in enumerate(matchups)
+                ],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def create_store() -> Optional[SnapshotStore]:
+    """
+    Snapshot store at LEAGUE_STORE_PATH, or None (no persistence) when unset.
+    """
+    path = os.environ.get("LEAGUE_STORE_PATH")
+    if not path:
+        return None
+    try:
+        return SnapshotStore(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to open league store at {path}: {e}")
+        return None
@@ -0,0 +1,46 @@
+import random
+from typing import Any, Dict
+
+def synthetic_league(num_teams: int, remaining_weeks: int, seed: int = 0, total_weeks: int = 14) -> Dict[str, Any]:
+    """
+    A random but internally consistent league in scrape_league's format:
+    records and points match the weeks already played and every remaining
+    week pairs all teams off at random.
+    """
+    if num_teams % 2:
+        raise ValueError("num_teams must be even")
+    rng = random.Random(seed)
+    current_week = total_weeks - remaining_weeks + 1
+    played = current_week - 1
+
+    teams = []
+    for i in range(num_teams):
+        wins = rng.randint(0, played)
+        points_for = round(sum(rng.gauss(110, 20) for _ in range(played)), 2)
+        teams.append({
+            "id": str(i + 1),
+            "name": f"Team {i + 1}",
+            "owner": f"Owner {i + 1}",
+            "wins": wins,
+            "losses": played - wins,
+            "ties": 0,
+            "points_for": points_for,
+            "points_against": round(sum(rng.gauss(110, 20) for _ in range(played)), 2),
+        })
+
+    schedule = []
+    for week in range(current_week, total_weeks + 1):
+        ids = [team["id"] for team in teams]
+        rng.shuffle(ids)
+        for k in range(0, num_teams, 2):
+            schedule.append({"week": week, "team1_id": ids[k], "team2_id": ids[k + 1], "completed": False})
+
+    return {
+        "league_id": f"synthetic-{num_teams}x{remaining_weeks}",
+        "name": f"Synthetic {num_teams} teams, {remaining_weeks} weeks",
+        "teams": teams,
+        "schedule": schedule,
+        "current_week": current_week,
+        "total_weeks": total_weeks,
+        "playoff_spots": min(6, num_teams // 2),
+    }
@@ -0,0 +1,255 @@
+"""
+End-to-end load test of the API against the local NFL.com stand-in.
+
+    python -m benchmarks.loadtest                                   # 500 /odds requests, 16 at a time
+    python -m benchmarks.loadtest --concurrency 64 --duration 30 --leagues 50
+    python -m benchmarks.loadtest --latency 200 --jitter 100 --error-rate 0.05
+    python -m benchmarks.loadtest --path "/api/league/{league_id}/scenarios" --conditional
+
+Starts benchmarks.stub_server in process and the app under uvicorn in a
+subprocess with NFL_BASE_URL pointing at the stub, so the real scraper,
+page cache, refresher and simulation all run, fully offline. The page
+cache directory and snapshot store are unset so every run starts cold.
+Requests cycle through --leagues distinct league ids; the first request
+for each one scrapes it, and the report splits those (cold) from the rest
+(warm). Reports throughput, latency percentiles, response statuses, the
+upstream requests the stub served and the app's page fetch counters.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import requests
+
+from .stub_server import add_stub_arguments, stub_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_LEAGUE_ID = 9000001
+STARTUP_TIMEOUT = 30.0
+TIMEOUT = 120.0
+
+PAGE_FETCH_LINE = re.compile(r'^playoff_page_fetches_total\{result="(\w+)"\} (\S+)$', re.M)
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_app(port: int, base_url: str, workers: int, refresh_interval: Optional[float]) -> subprocess.Popen:
+    """
+    Runs backend.main:app under uvicorn and waits until it answers.
+    """
+    env = dict(os.environ, NFL_BASE_URL=base_url)
+    env.pop("PAGE_CACHE_DIR", None)
+    env.pop("LEAGUE_STORE_PATH", None)
+    if refresh_interval is not None:
+        env["LEAGUE_REFRESH_INTERVAL"] = str(refresh_interval)
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup with code {process.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/", timeout=1).raise_for_status()
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"App did not start within {STARTUP_TIMEOUT:.0f}s")
+
+def stop_app(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def page_fetches(app_url: str) -> Dict[str, float]:
+    """
+    The app's page fetch counters by result. Per worker process, so only
+    complete with one worker.
+    """
+    try:
+        text = requests.get(f"{app_url}/metrics", timeout=10).text
+    except requests.RequestException:
+        return {}
+    return {result: float(value) for result, value in PAGE_FETCH_LINE.findall(text)}
+
+def run_load(
+    app_url: str,
+    path: str,
+    league_ids: List[str],
+    concurrency: int,
+    total: Optional[int],
+    duration: Optional[float],
+    conditional: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Sends requests from `concurrency` threads, cycling through `league_ids`,
+    until `total` requests are sent or `duration` seconds pass. Each thread
+    keeps its own keep-alive session. Returns one record per request.
+    """
+    records: List[Dict[str, Any]] = []
+    etags: Dict[str, str] = {}
+    seen = set()
+    lock = threading.Lock()
+    counter = iter(range(sys.maxsize))
+    deadline = time.monotonic() + duration if duration else None
+
+    def worker() -> None:
+        session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter)
+                if (total is not None and i >= total) or (deadline is not None and time.monotonic() >= deadline):
+                    return
+                league_id = league_ids[i % len(league_ids)]
+                cold = league_id not in seen
+                seen.add(league_id)
+                etag = etags.get(league_id) if conditional else None
+
+            headers = {"If-None-Match": etag} if etag else {}
+            start = time.perf_counter()
+            try:
+                response = session.get(app_url + path.format(league_id=league_id), headers=headers, timeout=TIMEOUT)
+                status = response.status_code
+                size = len(response.content)
+            except requests.RequestException:
+                response = None
+                status = 0 # Connection error or timeout
+                size = 0
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                records.append({"status": status, "seconds": elapsed, "cold": cold, "bytes": size})
+                if response is not None and response.headers.get("ETag"):
+                    etags[league_id] = response.headers["ETag"]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return records
+
+def latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    if not seconds:
+        return {"count": 0}
+    ms = np.array(seconds) * 1000
+    return {
+        "count": len(seconds),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p90_ms": round(float(np.percentile(ms, 90)), 1),
+        "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+def summarize(records: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    statuses: Dict[str, int] = {}
+    for r in records:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    ok = [r for r in records if r["status"] in (200, 304)]
+    return {
+        "requests": len(records),
+        "seconds": round(wall, 2),
+        "throughput_rps": round(len(ok) / wall, 1) if wall else None,
+        "statuses": statuses,
+        "mean_kb": round(sum(r["bytes"] for r in ok) / len(ok) / 1024, 1) if ok else None,
+        "latency": latency_summary([r["seconds"] for r in ok]),
+        "cold": latency_summary([r["seconds"] for r in ok if r["cold"]]),
+        "warm": latency_summary([r["seconds"] for r in ok if not r["cold"]]),
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    load = report["load"]
+    print(f"{load['requests']} requests in {load['seconds']}s at concurrency {report['concurrency']}: "
+          f"{load['throughput_rps']} req/s ok, statuses {load['statuses']}")
+    print(f"{'latency':<8} {'count':>7} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name in ("latency", "cold", "warm"):
+        s = load[name]
+        if s["count"]:
+            print(f"{name:<8} {s['count']:>7} {s['p50_ms']:>10.1f} {s['p90_ms']:>10.1f} {s['p99_ms']:>10.1f} {s['max_ms']:>10.1f}")
+    upstream = report["upstream"]
+    print(f"upstream: {upstream['requests']} requests, by page {upstream['by_kind']}, by status {upstream['by_status']}")
+    if report["page_fetches"]:
+        print(f"app page fetches: {report['page_fetches']}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight at once")
+    parser.add_argument("--requests", type=int, default=500, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="run for this many seconds instead")
+    parser.add_argument("--leagues", type=int, default=10, help="distinct league ids to cycle through")
+    parser.add_argument("--path", default="/api/league/{league_id}/odds", help="endpoint to load")
+    parser.add_argument("--conditional", action="store_true", help="revalidate with the last ETag per league")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--refresh-interval", type=float, default=None, help="LEAGUE_REFRESH_INTERVAL for the app, s")
+    parser.add_argument("--output", default=None, help="also write the report as JSON here")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    stub = stub_from_args(args, ("127.0.0.1", 0))
+    stub.start()
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+    app = start_app(port, stub.base_url, args.workers, args.refresh_interval)
+    try:
+        league_ids = [str(FIRST_LEAGUE_ID + i) for i in range(args.leagues)]
+        start = time.perf_counter()
+        records = run_load(
+            app_url,
+            args.path,
+            league_ids,
+            args.concurrency,
+            None if args.duration else args.requests,
+            args.duration,
+            args.conditional,
+        )
+        wall = time.perf_counter() - start
+        fetches = page_fetches(app_url) if args.workers == 1 else {}
+    finally:
+        stop_app(app)
+        stub.shutdown()
+        stub.server_close()
+
+    report = {
+        "path": args.path,
+        "concurrency": args.concurrency,
+        "leagues": args.leagues,
+        "workers": args.workers,
+        "stub": {
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "error_rate": args.error_rate,
+            "etags": not args.no_etags,
+        },
+        "load": summarize(records, wall),
+        "upstream": stub.stats.snapshot(),
+        "page_fetches": fetches,
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = sum(count for status, count in report["load"]["statuses"].items() if status not in ("200", "304"))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
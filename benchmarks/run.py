@@ -0,0 +1,218 @@
+"""
+Benchmarks for the odds, scenario and parser hot paths.
+
+    python -m benchmarks.run                      # run and compare with the baseline
+    python -m benchmarks.run --check              # ... and fail on a regression
+    python -m benchmarks.run --update-baseline    # record a new baseline
+    python -m benchmarks.run --filter parse --repeat 50
+
+Runs offline: leagues come from get_mock_league_data and
+benchmarks.leagues.synthetic_league, and the parsers read the checked-in
+debug_*.html fixtures. Each case reports p50/p99 latency, simulations per
+second where it simulates, and peak traced memory, and flags cases whose
+p50 is slower than the baseline by more than --threshold; with --check
+they also make it exit 1.
+
+Baselines are machine specific: the checked-in baseline.json only means
+something on the host that recorded it, so regenerate it with
+--update-baseline on the machine you compare on before using --check.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+from backend.calculator import SIMULATION_CACHE, analyze_team_scenarios, calculate_odds
+from backend.models import LeagueData
+from backend.plan import PLAN_CACHE, get_plan
+from backend.simulation import BATCH_SIZE, final_wins, make_rng, open_spots, rank_teams, simulate_outcomes
+from backend.parsers import parse_page_lxml
+from backend.scraper import get_mock_league_data, parse_schedule, parse_standings
+
+from .leagues import synthetic_league
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results.json")
+THRESHOLD = 0.25 # Allowed p50 slowdown before a case counts as a regression
+SEED = 1
+
+# (teams, remaining weeks); 8x1, 8x3 and 12x2 are small enough to enumerate exactly
+SYNTHETIC_LEAGUES = [(8, 1), (8, 3), (12, 2), (12, 4), (16, 3), (20, 5), (32, 6)]
+
+PARSER_FIXTURES = ["debug_league.html", "debug_schedule_v2.html", "debug_week13_main.html"]
+
+def odds_case(league: Dict[str, Any]) -> Callable[[], int]:
+    def run() -> int:
+        PLAN_CACHE.clear()
+        SIMULATION_CACHE.clear()
+        odds = calculate_odds(league, seed=SEED)
+        return odds[0]["simulations"]
+    return run
+
+def scenarios_case(league: Dict[str, Any]) -> Callable[[], int]:
+    model = LeagueData(**league)
+    focus = league["teams"][len(league["teams"]) // 2]["id"]
+    def run() -> int:
+        PLAN_CACHE.clear()
+        SIMULATION_CACHE.clear()
+        analyze_team_scenarios(model, focus, seed=SEED)
+        return 0
+    return run
+
+def rank_case(league: Dict[str, Any]) -> Callable[[], int]:
+    """
+    The ranking kernel alone on one batch of sampled outcomes.
+    """
+    arrays = get_plan(league).arrays
+    wins = final_wins(arrays, simulate_outcomes(arrays, BATCH_SIZE, make_rng(SEED)))
+    spots = open_spots(arrays, league["playoff_spots"])
+    def run() -> int:
+        rank_teams(arrays, wins, spots)
+        return BATCH_SIZE
+    return run
+
+def call_case(fn: Callable, *args: Any) -> Callable[[], int]:
+    def run() -> int:
+        fn(*args)
+        return 0
+    return run
+
+def parse_page_bs4(content: bytes) -> None:
+    parse_standings(BeautifulSoup(content, "html.parser"))
+
+def build_cases() -> Dict[str, Callable[[], int]]:
+    """
+    Case name -> callable returning the number of simulations it ran.
+    """
+    leagues = [("mock", get_mock_league_data("mock"))]
+    leagues += [
+        (f"{teams}x{weeks}", synthetic_league(teams, weeks, seed=SEED))
+        for teams, weeks in SYNTHETIC_LEAGUES
+    ]
+
+    cases: Dict[str, Callable[[], int]] = {}
+    for name, league in leagues:
+        cases[f"odds/{name}"] = odds_case(league)
+        cases[f"rank/{name}"] = rank_case(league)
+        cases[f"scenarios/{name}"] = scenarios_case(league)
+
+    for fixture in PARSER_FIXTURES:
+        path = os.path.join(ROOT, fixture)
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        soup = BeautifulSoup(content, "html.parser")
+        cases[f"parse/{fixture}/standings_bs4"] = call_case(parse_standings, soup)
+        cases[f"parse/{fixture}/schedule_bs4"] = call_case(parse_schedule, soup, 13)
+        cases[f"parse/{fixture}/page_bs4"] = call_case(parse_page_bs4, content)
+        cases[f"parse/{fixture}/page_lxml"] = call_case(parse_page_lxml, content, 13)
+    return cases
+
+def measure(run: Callable[[], int], repeat: int) -> Dict[str, Any]:
+    """
+    Times `repeat` calls after one warm-up call, then measures peak traced
+    memory over one more call.
+    """
+    run()
+    timings = []
+    simulations = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simulations += run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings_ms = np.array(timings) * 1000
+    total = sum(timings)
+    return {
+        "repeat": repeat,
+        "p50_ms": round(float(np.percentile(timings_ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(timings_ms, 99)), 3),
+        "mean_ms": round(float(timings_ms.mean()), 3),
+        "sims_per_sec": round(simulations / total) if simulations else None,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Names of cases whose p50 regressed by more than `threshold` (a fraction).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else 1.0
+        current["baseline_p50_ms"] = previous["p50_ms"]
+        current["change"] = round(ratio - 1, 3)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'case':<48} {'p50 ms':>10} {'p99 ms':>10} {'sims/s':>12} {'peak MB':>9} {'vs base':>8}")
+    for name, r in results.items():
+        sims = f"{r['sims_per_sec']:,}" if r["sims_per_sec"] else "-"
+        change = f"{r['change']:+.0%}" if "change" in r else "-"
+        print(f"{name:<48} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {sims:>12} {r['peak_mb']:>9.2f} {change:>8}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed p50 slowdown, e.g. 0.25")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any case regressed past --threshold")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # The scraper logs every page it parses at INFO, which would be timed too
+    logging.getLogger("backend").setLevel(logging.WARNING)
+
+    results = {}
+    for name, run in build_cases().items():
+        if args.filter in name:
+            results[name] = measure(run, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    print_table(results)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+    for path in [args.output] + ([args.baseline] if args.update_baseline else []):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
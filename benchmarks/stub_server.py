@@ -0,0 +1,214 @@
+"""
+Local stand-in for fantasy.nfl.com serving the checked-in debug_*.html pages.
+
+    python -m benchmarks.stub_server --port 8765 --latency 150 --jitter 50 --error-rate 0.02
+    NFL_BASE_URL=http://127.0.0.1:8765/league uvicorn backend.main:app
+
+/league/{id} serves debug_league.html for any league id, and
+/league/{id}?week=N one of the schedule fixtures (rotating by week), so
+every league id is a distinct league to the app with the same teams and
+matchups. Responses carry an ETag and honour If-None-Match, like the real
+site. Latency, jitter and a random error rate are configurable; /_stats
+returns request counts by page kind and status as JSON.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEAGUE_FIXTURE = "debug_league.html"
+# debug_schedule.html and debug_week13.html have no matchup list (an empty
+# week to the parser); pass them with --schedule to exercise that path
+SCHEDULE_FIXTURES = ["debug_schedule_v2.html", "debug_week13_main.html"]
+ERROR_STATUSES = [500, 502, 503, 429]
+
+LEAGUE_PATH = re.compile(r"^/league/(\d+)/?$")
+
+class Fixture:
+    __slots__ = ("content", "etag")
+
+    def __init__(self, name: str):
+        with open(os.path.join(ROOT, name), "rb") as f:
+            self.content = f.read()
+        self.etag = '"' + hashlib.sha256(self.content).hexdigest()[:16] + '"'
+
+class StubStats:
+    """
+    Thread-safe request counts by page kind ("league", "week", "other") and
+    response status.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def record(self, kind: str, status: int) -> None:
+        with self._lock:
+            self._counts[(kind, status)] = self._counts.get((kind, status), 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        by_kind: Dict[str, int] = {}
+        by_status: Dict[str, int] = {}
+        for (kind, status), count in counts.items():
+            by_kind[kind] = by_kind.get(kind, 0) + count
+            by_status[str(status)] = by_status.get(str(status), 0) + count
+        return {"requests": sum(counts.values()), "by_kind": by_kind, "by_status": by_status}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real site
+    server: "StubServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/_stats":
+            self._send(200, json.dumps(self.server.stats.snapshot()).encode(), content_type="application/json")
+            return
+
+        match = LEAGUE_PATH.match(url.path)
+        if match is None:
+            self.server.stats.record("other", 404)
+            self._send(404, b"Not Found")
+            return
+
+        week = parse_qs(url.query).get("week", [None])[0]
+        kind = "league" if week is None else "week"
+        self.server.delay()
+
+        status = self.server.injected_error()
+        if status is not None:
+            self.server.stats.record(kind, status)
+            self._send(status, b"Injected error")
+            return
+
+        fixture = self.server.fixture_for(week)
+        if self.server.etags and self.headers.get("If-None-Match") == fixture.etag:
+            self.server.stats.record(kind, 304)
+            self._send(304, b"", etag=fixture.etag)
+            return
+        self.server.stats.record(kind, 200)
+        self._send(200, fixture.content, etag=fixture.etag if self.server.etags else None)
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """
+    The stand-in server. `latency` and `jitter` are in seconds: each page
+    waits latency ± jitter before responding. A fraction `error_rate` of
+    page requests fail with a random 5xx or 429.
+    """
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        etags: bool = True,
+        schedule_fixtures: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.etags = etags
+        self.league = Fixture(LEAGUE_FIXTURE)
+        self.schedules = [Fixture(name) for name in (schedule_fixtures or SCHEDULE_FIXTURES)]
+        self.stats = StubStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/league"
+
+    def fixture_for(self, week: Optional[str]) -> Fixture:
+        if week is None:
+            return self.league
+        index = int(week) if week.isdigit() else 0
+        return self.schedules[index % len(self.schedules)]
+
+    def delay(self) -> None:
+        with self._rng_lock:
+            seconds = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def injected_error(self) -> Optional[int]:
+        with self._rng_lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._rng.choice(ERROR_STATUSES)
+        return None
+
+    def start(self) -> threading.Thread:
+        """
+        Serves from a daemon thread; stop with shutdown().
+        """
+        thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        thread.start()
+        return thread
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="upstream latency per page, ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± random latency per page, ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of pages failing with 5xx/429")
+    parser.add_argument("--no-etags", action="store_true", help="never send ETags or answer 304")
+    parser.add_argument("--schedule", nargs="+", default=SCHEDULE_FIXTURES, help="week page fixtures to rotate")
+
+def stub_from_args(args: argparse.Namespace, address: Tuple[str, int]) -> StubServer:
+    return StubServer(
+        address,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        etags=not args.no_etags,
+        schedule_fixtures=args.schedule,
+    )
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = stub_from_args(args, (args.host, args.port))
+    print(f"Serving {server.base_url} (NFL_BASE_URL), stats at /_stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
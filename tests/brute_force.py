@@ -0,0 +1,66 @@
+"""
+Reference answers by full enumeration, written independently of the engine:
+every result of every remaining game, teams ordered by Wins, then Points
+For, then their order in the league.
+"""
+from itertools import product
+from typing import Any, Dict, List, Optional
+
+def remaining_games(league: Dict[str, Any]) -> List[Dict[str, Any]]:
+    ids = {t["id"] for t in league["teams"]}
+    return [
+        g for g in league["schedule"]
+        if not g.get("completed", False) and g["team1_id"] in ids and g["team2_id"] in ids
+    ]
+
+def win_probability(league: Dict[str, Any], game: Dict[str, Any]) -> float:
+    points_for = {t["id"]: t["points_for"] for t in league["teams"]}
+    pf1, pf2 = points_for[game["team1_id"]], points_for[game["team2_id"]]
+    return (pf1 + 0.5) / (pf1 + pf2 + 1.0)
+
+def enumerate_league(league: Dict[str, Any], locks: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Per team id: playoff probability, seed probabilities (first place
+    first), and whether it makes the playoffs in every / no outcome.
+    `locks` maps game keys to the winning team id.
+    """
+    locks = locks or {}
+    teams = league["teams"]
+    games = remaining_games(league)
+    probs = [win_probability(league, g) for g in games]
+    keys = [f"{g['week']}-{g['team1_id']}-{g['team2_id']}" for g in games]
+
+    playoff = {t["id"]: 0.0 for t in teams}
+    seeds = {t["id"]: [0.0] * len(teams) for t in teams}
+    always = {t["id"]: True for t in teams}
+    never = {t["id"]: True for t in teams}
+    total = 0.0
+    for results in product((True, False), repeat=len(games)):
+        winners = [g["team1_id"] if won else g["team2_id"] for g, won in zip(games, results)]
+        if any(key in locks and locks[key] != winner for key, winner in zip(keys, winners)):
+            continue
+        weight = 1.0
+        wins = {t["id"]: t["wins"] for t in teams}
+        for p, won, winner in zip(probs, results, winners):
+            weight *= p if won else 1 - p
+            wins[winner] += 1
+        total += weight
+
+        order = sorted(range(len(teams)), key=lambda i: (-wins[teams[i]["id"]], -teams[i]["points_for"], i))
+        for place, i in enumerate(order):
+            tid = teams[i]["id"]
+            seeds[tid][place] += weight
+            made = place < league["playoff_spots"]
+            playoff[tid] += weight if made else 0.0
+            always[tid] = always[tid] and made
+            never[tid] = never[tid] and not made
+
+    return {
+        tid: {
+            "playoff": playoff[tid] / total,
+            "seeds": [p / total for p in seeds[tid]],
+            "always": always[tid],
+            "never": never[tid],
+        }
+        for tid in playoff
+    }
@@ -0,0 +1,27 @@
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+
+@pytest.fixture
+def leagues(monkeypatch):
+    """
+    League id -> league data served in place of NFL.com. Each test starts
+    with an empty refresher, so the first request loads from here.
+    """
+    leagues = {}
+
+    async def load(league_id):
+        if league_id not in leagues:
+            raise ValueError(f"League {league_id} not found")
+        return copy.deepcopy(leagues[league_id])
+
+    monkeypatch.setattr(main.league_refresher, "load", load)
+    monkeypatch.setattr(main.league_refresher, "_entries", {})
+    return leagues
+
+@pytest.fixture
+def client(leagues):
+    return TestClient(main.app)
@@ -0,0 +1,39 @@
+"""
+Stand-in for the requests.Session behind backend.fetch: serves pages from
+a dict, honours If-None-Match like the real site and records every
+request it gets.
+"""
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+class StubResponse:
+    def __init__(self, url: str, status_code: int, content: bytes = b"", etag: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}")
+
+class StubSession:
+    def __init__(self, pages: Optional[Dict[str, bytes]] = None):
+        self.pages: Dict[str, bytes] = dict(pages or {})
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> StubResponse:
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        if url not in self.pages:
+            return StubResponse(url, 404)
+        content = self.pages[url]
+        etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+        if headers.get("If-None-Match") == etag:
+            return StubResponse(url, 304, etag=etag)
+        return StubResponse(url, 200, content, etag)
+
+    def urls(self) -> List[str]:
+        return [url for url, _ in self.requests]
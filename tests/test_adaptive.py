@@ -0,0 +1,83 @@
+import itertools
+import types
+
+import numpy as np
+import pytest
+
+from backend import calculator, simulation
+from backend.simulation import (
+    BATCH_SIZE,
+    build_game_arrays,
+    iter_adaptive,
+    iter_simulate_league,
+    iter_simulation_batches,
+    make_rng,
+    wilson_half_width,
+)
+from benchmarks.leagues import synthetic_league
+
+@pytest.fixture(scope="module")
+def league():
+    league = synthetic_league(10, 3, seed=2)
+    return league, build_game_arrays(league["teams"], league["schedule"])
+
+def widths(arrays, made):
+    active = arrays["active"]
+    return 2 * wilson_half_width(made[:, active].sum(axis=0), len(made))
+
+def test_stops_once_every_interval_is_narrow_enough(league):
+    league, arrays = league
+    target = 0.01
+    items = list(iter_simulate_league(
+        arrays, league["playoff_spots"], 10**6, seed=0, exact_max_games=0, target_width=target,
+    ))
+    *progress, result = items
+    assert len(progress) >= 2
+    assert result["final"] and result["stop_reason"] == "precision"
+    assert result["simulations"] == len(result["made"]) == len(result["outcome_bits"])
+    assert result["simulations"] == BATCH_SIZE * len(items)
+    assert widths(arrays, result["made"]).max() <= target
+    # Every earlier snapshot still had a team above the target
+    for snapshot in progress:
+        assert not snapshot["final"]
+        assert snapshot["successes"].shape == (len(arrays["team_ids"]),)
+        n = snapshot["simulations"]
+        assert n < result["simulations"]
+        assert (2 * wilson_half_width(snapshot["successes"][arrays["active"]], n)).max() > target
+
+def test_simulation_cap_is_exact(league):
+    league, arrays = league
+    cap = BATCH_SIZE + 123
+    result = simulation.simulate_league(
+        arrays, league["playoff_spots"], cap, seed=0, exact_max_games=0, target_width=1e-4,
+    )
+    assert result["stop_reason"] == "max_simulations"
+    assert result["simulations"] == len(result["made"]) == cap
+    assert result["weights"].sum() == pytest.approx(1.0)
+
+def test_time_budget_is_respected(league, monkeypatch):
+    league, arrays = league
+    # One tick per clock read: the budget runs out on the third check
+    clock = itertools.count()
+    monkeypatch.setattr(simulation, "time", types.SimpleNamespace(monotonic=lambda: next(clock)))
+    batches = iter_simulation_batches(arrays, league["playoff_spots"], 100, make_rng(0))
+    progress = list(iter_adaptive(arrays, batches, 10**6, 1e-4, time_budget=2.5))
+    assert [p["stop_reason"] for p in progress] == [None, None, "time_budget"]
+    assert progress[-1]["simulations"] == 300
+
+def test_odds_report_what_ran(league):
+    league, arrays = league
+    calculator.SIMULATION_CACHE.clear()
+    target = 0.05
+    odds = calculator.calculate_odds(league, simulations=10**6, seed=0, exact_max_games=0, target_width=target)
+    sim = calculator.get_simulation(league, 10**6, 0, 0, target)
+
+    half_widths = dict(zip(sim["arrays"]["team_ids"], calculator.confidence_half_widths(sim)))
+    for entry in odds:
+        assert entry["simulations"] == sim["simulations"] == len(sim["made"])
+        assert entry["margin_of_error"] == round(half_widths[entry["team_id"]] * 100, 2)
+        assert entry["margin_of_error"] <= target / 2 * 100
+    # Decided teams carry no margin
+    decided = [entry for entry in odds if entry["clinched_playoffs"] or entry["eliminated"]]
+    assert all(entry["margin_of_error"] == 0 for entry in decided)
+    assert max(entry["margin_of_error"] for entry in odds) > 0
@@ -0,0 +1,159 @@
+import asyncio
+import copy
+import json
+import threading
+
+import pytest
+
+from backend import calculator, main, simulation
+from benchmarks.leagues import synthetic_league
+
+def test_odds_show_renamed_team(leagues, client):
+    leagues["1"] = synthetic_league(8, 3, seed=0)
+    names = {entry["team_name"] for entry in client.get("/api/league/1/odds").json()}
+    assert "Team 1" in names
+
+    leagues["1"]["teams"][0]["name"] = "Renamed"
+    main.league_refresher._entries.clear()
+    names = {entry["team_name"] for entry in client.get("/api/league/1/odds").json()}
+    assert "Renamed" in names and "Team 1" not in names
+
+    leverage = client.get("/api/league/1/leverage").json()
+    assert "Renamed" in {row["team_name"] for game in leverage for row in game["teams"]}
+
+def test_simulation_flights_are_keyed_by_league_state(monkeypatch):
+    old = synthetic_league(8, 3, seed=0)
+    refreshed = copy.deepcopy(old)
+    refreshed["teams"][0]["wins"] += 1
+    calls = []
+    lock = threading.Lock()
+
+    def get_simulation(league_data):
+        with lock:
+            calls.append(league_data["teams"][0]["wins"])
+        threading.Event().wait(0.05)
+        return league_data["teams"][0]["wins"]
+
+    monkeypatch.setattr(main, "get_simulation", get_simulation)
+
+    async def scenario():
+        return await asyncio.gather(
+            main.load_simulation("1", old),
+            main.load_simulation("1", old),
+            main.load_simulation("1", refreshed),
+        )
+
+    wins = old["teams"][0]["wins"]
+    assert asyncio.run(scenario()) == [wins, wins, wins + 1]
+    assert sorted(calls) == [wins, wins + 1]
+
+def test_batch_odds_stream_one_line_per_league(leagues, client):
+    leagues["1"] = synthetic_league(8, 3, seed=0)
+    leagues["2"] = synthetic_league(6, 2, seed=1)
+    response = client.post("/api/leagues/odds", json={"league_ids": ["1", "missing", "2", "1"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    by_league = {line["league_id"]: line for line in lines}
+    assert len(lines) == 3 and set(by_league) == {"1", "missing", "2"}
+    # The failing league gets its own error line and the others still arrive
+    assert by_league["missing"] == {"league_id": "missing", "status": "error", "detail": "League missing not found"}
+    for league_id in ("1", "2"):
+        assert by_league[league_id]["status"] == "ok"
+        assert by_league[league_id]["odds"] == client.get(f"/api/league/{league_id}/odds").json()
+
+def test_batch_odds_caps_league_count(leagues, client):
+    leagues.update({str(i): synthetic_league(6, 1, seed=i) for i in range(main.MAX_BATCH_LEAGUES + 1)})
+    league_ids = list(leagues)
+    response = client.post("/api/leagues/odds", json={"league_ids": league_ids})
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"At most {main.MAX_BATCH_LEAGUES} leagues per request"
+    assert len(main.league_refresher) == 0
+
+    # Repeated ids count once
+    response = client.post("/api/leagues/odds", json={"league_ids": league_ids[:-1] + league_ids[:1]})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == main.MAX_BATCH_LEAGUES
+
+def sse_events(chunks):
+    """
+    (event, data) pairs from a Server-Sent Events body.
+    """
+    events = []
+    for block in "".join(chunks).split("\n\n"):
+        if block:
+            name, data = block.split("\n")
+            events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+@pytest.fixture
+def sampled_league(leagues, monkeypatch):
+    """
+    A league too big to enumerate, sampled in small batches so the
+    adaptive run reports progress several times.
+    """
+    monkeypatch.setattr(simulation, "BATCH_SIZE", 500)
+    monkeypatch.setattr(main, "scrape_league_header", lambda league_id: {**leagues[league_id], "schedule": []})
+    calculator.SIMULATION_CACHE.clear()
+    leagues["1"] = synthetic_league(12, 4, seed=0)
+    return leagues["1"]
+
+def test_odds_stream_sends_progress_then_final(sampled_league, client):
+    events = sse_events(client.get("/api/league/1/odds/stream").iter_text())
+    names = [name for name, _ in events]
+    assert names[0] == "league" and names[-1] == "done"
+    assert set(names[1:-1]) == {"odds"}
+    assert events[0][1]["name"] == sampled_league["name"] and events[0][1]["schedule"] == []
+
+    *provisional, final = [data for name, data in events if name == "odds"]
+    assert len(provisional) >= 2
+    assert not any(update["final"] for update in provisional)
+    counts = [update["simulations"] for update in provisional]
+    assert counts == sorted(set(counts)) and counts[-1] < final["simulations"]
+    assert final["final"]
+    assert final["odds"] == client.get("/api/league/1/odds").json()
+
+def test_second_stream_follows_the_run_in_flight(sampled_league, monkeypatch):
+    resume = threading.Event()
+    runs = []
+    iter_odds = main.iter_odds
+
+    def gated_iter_odds(league_data):
+        # Holds the run after its first batch until the second stream is in
+        runs.append(league_data)
+        for i, update in enumerate(iter_odds(league_data)):
+            yield update
+            if i == 0:
+                resume.wait(5)
+
+    monkeypatch.setattr(main, "iter_odds", gated_iter_odds)
+
+    async def collect(stream, limit=None):
+        events = []
+        async for chunk in stream:
+            events += sse_events([chunk])
+            if len(events) == limit:
+                break
+        return events
+
+    async def scenario():
+        first = (await main.stream_playoff_odds("1")).body_iterator
+        first_events = await collect(first, limit=2)
+        second = (await main.stream_playoff_odds("1")).body_iterator
+        second_events = asyncio.ensure_future(collect(second))
+        await asyncio.sleep(0.1)
+        resume.set()
+        return first_events + await collect(first), await second_events
+
+    first, second = asyncio.run(scenario())
+    assert len(runs) == 1
+    for events in (first, second):
+        assert [name for name, _ in events][-2:] == ["odds", "done"]
+    first_odds = [data for name, data in first if name == "odds"]
+    second_odds = [data for name, data in second if name == "odds"]
+    # The second stream joined after the first batch and saw the rest of the run
+    assert not second_odds[0]["final"]
+    assert second_odds[0]["simulations"] > first_odds[0]["simulations"]
+    assert [update["simulations"] for update in second_odds] == [update["simulations"] for update in first_odds[1:]]
+    assert second_odds[-1] == first_odds[-1]
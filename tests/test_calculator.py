@@ -0,0 +1,34 @@
+from backend.calculator import (
+    analyze_all_scenarios,
+    analyze_team_scenarios,
+    calculate_odds,
+    iter_odds,
+    leverage_table,
+    whatif_odds,
+)
+from backend.models import LeagueData
+from backend.plan import get_plan
+from backend.simulation import simulate_league
+
+EMPTY_LEAGUE = {
+    "league_id": "empty",
+    "name": "Empty",
+    "teams": [],
+    "schedule": [],
+    "current_week": 12,
+    "total_weeks": 14,
+    "playoff_spots": 6,
+}
+
+def test_league_without_teams():
+    assert calculate_odds(EMPTY_LEAGUE) == []
+    assert list(iter_odds(EMPTY_LEAGUE)) == [{"final": True, "simulations": 0, "odds": []}]
+    assert leverage_table(EMPTY_LEAGUE) == []
+    assert whatif_odds(EMPTY_LEAGUE, {})["odds"] == []
+    assert analyze_all_scenarios(LeagueData(**EMPTY_LEAGUE)) == []
+    assert analyze_team_scenarios(LeagueData(**EMPTY_LEAGUE), "1")["probability"] == 0.0
+
+def test_engine_handles_no_teams():
+    sim = simulate_league(get_plan(EMPTY_LEAGUE).arrays, 6, 1000, positions=True)
+    assert sim["seeds"].shape == (0, 0)
+    assert sim["made"].shape == (1, 0)
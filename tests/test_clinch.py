@@ -0,0 +1,30 @@
+import pytest
+
+from backend.clinch import clinch_status
+from benchmarks.leagues import synthetic_league
+
+from .brute_force import enumerate_league
+
+@pytest.mark.parametrize("teams,weeks", [(4, 2), (6, 1), (6, 2), (8, 1), (8, 2)])
+@pytest.mark.parametrize("playoff_spots", [1, 2, 4])
+@pytest.mark.parametrize("seed", range(8))
+def test_clinch_status_matches_enumeration(teams, weeks, playoff_spots, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    league["playoff_spots"] = min(playoff_spots, teams - 1)
+    expected = enumerate_league(league)
+
+    for status in clinch_status(league):
+        tid = status["team_id"]
+        assert status["determined"]
+        assert status["clinched_playoffs"] == expected[tid]["always"]
+        assert status["eliminated"] == expected[tid]["never"]
+
+def test_clinch_status_with_tied_points_for():
+    league = synthetic_league(6, 2, seed=3)
+    for team in league["teams"]:
+        team["points_for"] = 1000.0
+    expected = enumerate_league(league)
+
+    for status in clinch_status(league):
+        assert status["clinched_playoffs"] == expected[status["team_id"]]["always"]
+        assert status["eliminated"] == expected[status["team_id"]]["never"]
@@ -0,0 +1,126 @@
+import os
+import types
+
+import pytest
+import requests
+
+from backend import fetch, page_cache
+from backend.page_cache import DiskPageCache, MemoryPageCache, Page
+
+from .http_stub import StubSession
+
+URL = "https://fantasy.nfl.com/league/1?week=3"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Wall clock for page expiry, moved by hand.
+    """
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    fake_time = types.SimpleNamespace(time=lambda: clock.now)
+    monkeypatch.setattr(fetch, "time", fake_time)
+    monkeypatch.setattr(page_cache, "time", fake_time)
+    return clock
+
+@pytest.fixture
+def session(monkeypatch, clock):
+    session = StubSession({URL: b"week 3"})
+    monkeypatch.setattr(fetch, "_session", session)
+    monkeypatch.setattr(fetch, "_page_cache", MemoryPageCache())
+    return session
+
+def test_fresh_page_is_served_from_cache(session):
+    page = fetch.fetch(URL, ttl=60)
+    assert fetch.fetch(URL, ttl=60) is page
+    assert page.content == b"week 3"
+    assert session.urls() == [URL]
+
+def test_ttl_zero_revalidates_and_reuses_the_body(session):
+    page = fetch.fetch(URL, ttl=60)
+    again = fetch.fetch(URL, ttl=0)
+    assert again is page and again.content == b"week 3"
+    (_, first), (_, second) = session.requests
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == page.etag
+
+def test_expired_page_is_revalidated(session, clock):
+    page = fetch.fetch(URL, ttl=60)
+    clock.now += 30
+    assert fetch.fetch(URL, ttl=60) is page
+    assert len(session.requests) == 1
+
+    clock.now += 31
+    assert fetch.fetch(URL, ttl=60) is page
+    assert len(session.requests) == 2
+    # The 304 pushed the expiry out again
+    assert page.expires_at == clock.now + 60
+
+    session.pages[URL] = b"week 3, final"
+    clock.now += 61
+    updated = fetch.fetch(URL, ttl=60)
+    assert updated.content == b"week 3, final"
+    assert fetch.get_page_cache().get(URL) is updated
+
+def test_ttl_none_never_goes_stale(session, clock):
+    page = fetch.fetch(URL, ttl=None)
+    assert page.expires_at is None
+    clock.now += 10**9
+    assert fetch.fetch(URL, ttl=None) is page
+    assert len(session.requests) == 1
+    # An explicit revalidation still goes out
+    fetch.fetch(URL, ttl=0)
+    assert len(session.requests) == 2
+
+def test_without_cache_every_fetch_downloads(session, monkeypatch):
+    monkeypatch.setattr(fetch, "_page_cache", None)
+    fetch.fetch(URL, ttl=60)
+    fetch.fetch(URL, ttl=60)
+    assert [headers for _, headers in session.requests] == [{}, {}]
+
+def test_fetch_all_returns_failures_in_place(session):
+    missing = "https://fantasy.nfl.com/league/1?week=99"
+    page, error = fetch.fetch_all([URL, missing])
+    assert page.content == b"week 3"
+    assert isinstance(error, requests.HTTPError)
+
+def test_parsed_is_memoized_and_copied():
+    calls = []
+
+    def parse(content):
+        calls.append(content)
+        return {"games": [content.decode()]}
+
+    page = Page(URL, b"week 3")
+    first = page.parsed("schedule", parse)
+    first["games"].append("mutated")
+    assert page.parsed("schedule", parse) == {"games": ["week 3"]}
+    assert calls == [b"week 3"]
+
+def test_disk_cache_round_trips_pages(tmp_path):
+    DiskPageCache(str(tmp_path)).set(URL, Page(URL, b"week 3", etag='"abc"', last_modified="Sun", expires_at=5.0))
+    page = DiskPageCache(str(tmp_path)).get(URL)
+    assert (page.url, page.content, page.etag, page.last_modified, page.expires_at) == (
+        URL, b"week 3", '"abc"', "Sun", 5.0,
+    )
+    assert DiskPageCache(str(tmp_path)).get("https://fantasy.nfl.com/other") is None
+
+def test_disk_cache_evicts_least_recently_read(tmp_path):
+    directory = str(tmp_path)
+    urls = [f"https://fantasy.nfl.com/league/1?week={week}" for week in range(3)]
+    cache = DiskPageCache(directory, max_bytes=25)
+    for url in urls[:2]:
+        cache.set(url, Page(url, b"0123456789"))
+    # Week 0 was written first but read most recently
+    for url, mtime in zip(urls[:2], (1000, 2000)):
+        body_path, _ = cache._paths(url)
+        os.utime(body_path, (mtime, mtime))
+    cache = DiskPageCache(directory, max_bytes=25)
+    assert cache.get(urls[0]).content == b"0123456789"
+
+    cache.set(urls[2], Page(urls[2], b"0123456789"))
+    reopened = DiskPageCache(directory, max_bytes=25)
+    assert reopened.get(urls[1]) is None
+    assert reopened.get(urls[0]) is not None and reopened.get(urls[2]) is not None
+    assert sorted(os.listdir(directory)) == sorted(
+        os.path.basename(path) for url in (urls[0], urls[2]) for path in cache._paths(url)
+    )
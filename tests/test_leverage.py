@@ -0,0 +1,53 @@
+import pytest
+
+from backend.calculator import get_simulation, leverage_matrix, leverage_table
+from benchmarks.leagues import synthetic_league
+
+from .brute_force import enumerate_league
+
+def conditional_odds(league, game_key):
+    """
+    Brute-force playoff odds with the game won by team 1, then by team 2.
+    """
+    _, team1_id, team2_id = game_key.split("-")
+    return enumerate_league(league, {game_key: team1_id}), enumerate_league(league, {game_key: team2_id})
+
+@pytest.mark.parametrize("teams,weeks", [(6, 2), (8, 3)])
+@pytest.mark.parametrize("seed", range(2))
+def test_leverage_matrix_matches_brute_force(teams, weeks, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    sim = get_simulation(league)
+    assert sim["exact"]
+    matrix = leverage_matrix(sim)
+    arrays = sim["arrays"]
+
+    for g, game_key in enumerate(arrays["game_keys"]):
+        if_team1, if_team2 = conditional_odds(league, game_key)
+        for i, tid in enumerate(arrays["team_ids"]):
+            assert matrix["if_team1"][i, g] == pytest.approx(if_team1[tid]["playoff"], abs=1e-9)
+            assert matrix["if_team2"][i, g] == pytest.approx(if_team2[tid]["playoff"], abs=1e-9)
+
+def test_leverage_table_matches_brute_force():
+    league = synthetic_league(8, 3, seed=0)
+    table = leverage_table(league)
+    assert table
+
+    for game in table:
+        if_team1, if_team2 = conditional_odds(league, game["game_key"])
+        for row in game["teams"]:
+            tid = row["team_id"]
+            assert row["if_team1_wins"] == pytest.approx(if_team1[tid]["playoff"] * 100, abs=0.051)
+            assert row["if_team2_wins"] == pytest.approx(if_team2[tid]["playoff"] * 100, abs=0.051)
+            expected = (if_team1[tid]["playoff"] - if_team2[tid]["playoff"]) * 100
+            assert row["leverage"] == pytest.approx(expected, abs=0.11)
+        assert game["max_leverage"] == max(abs(row["leverage"]) for row in game["teams"])
+
+def test_sampled_leverage_is_close_to_brute_force():
+    league = synthetic_league(8, 3, seed=1)
+    table = leverage_table(league, simulations=200000, seed=0, exact_max_games=0, target_width=None)
+
+    for game in table:
+        if_team1, if_team2 = conditional_odds(league, game["game_key"])
+        for row in game["teams"]:
+            expected = (if_team1[row["team_id"]]["playoff"] - if_team2[row["team_id"]]["playoff"]) * 100
+            assert row["leverage"] == pytest.approx(expected, abs=1.0)
@@ -0,0 +1,97 @@
+import re
+
+from backend import calculator, metrics
+from backend.metrics import Histogram, Timings, render_metrics
+from benchmarks.leagues import synthetic_league
+
+SAMPLE = re.compile(r'^([a-z_]+)(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? -?[0-9.e+-]+$')
+SERVER_TIMING = re.compile(r"^[a-z]+;dur=\d+\.\d(, [a-z]+;dur=\d+\.\d)*$")
+
+def families(text):
+    """
+    Metric name -> (type, sample lines) from the text exposition format.
+    """
+    found = {}
+    name = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            name = line.split()[2]
+        elif line.startswith("# TYPE "):
+            assert line.split()[2] == name
+            found[name] = (line.split()[3], [])
+        else:
+            assert SAMPLE.match(line), line
+            assert line.startswith(name)
+            found[name][1].append(line)
+    return found
+
+def series(lines, suffix, labels):
+    return [float(line.rsplit(" ", 1)[1]) for line in lines if suffix + "{" in line and labels in line]
+
+def test_metrics_exposition_format(leagues, client):
+    leagues["1"] = synthetic_league(8, 3, seed=0)
+    assert client.get("/api/league/1/odds").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert response.text.endswith("\n")
+    found = families(response.text)
+    assert found["playoff_page_fetches_total"][0] == "counter"
+    assert found["playoff_simulation_cache_bytes"][0] == "gauge"
+
+    kind, lines = found["playoff_request_duration_seconds"]
+    assert kind == "histogram"
+    labels = 'route="/api/league/{league_id}/odds",status="200"'
+    buckets = series(lines, "_bucket", labels)
+    # Buckets are cumulative and end with +Inf, which equals the count
+    assert buckets == sorted(buckets)
+    assert any('le="+Inf"' in line for line in lines)
+    assert buckets[-1] == series(lines, "_count", labels)[0] >= 1
+    assert series(found["playoff_stage_duration_seconds"][1], "_count", 'stage="simulate"')[0] >= 1
+
+def test_server_timing_header(leagues, client):
+    calculator.SIMULATION_CACHE.clear()
+    leagues["1"] = synthetic_league(8, 3, seed=0)
+    header = client.get("/api/league/1/odds").headers["Server-Timing"]
+    assert SERVER_TIMING.match(header), header
+    stages = [entry.split(";")[0] for entry in header.split(", ")]
+    # Work done on the thread pools is attributed to the request
+    assert {"simulate", "rank", "analyze"} <= set(stages)
+    assert stages[-1] == "total"
+    assert client.get("/").headers["Server-Timing"].startswith("total;dur=")
+
+def test_debug_wraps_json_with_timings(leagues, client):
+    leagues["1"] = synthetic_league(8, 3, seed=0)
+    plain = client.get("/api/league/1/odds").json()
+    response = client.get("/api/league/1/odds?debug=1")
+    body = response.json()
+    assert set(body) == {"data", "timings"}
+    assert body["data"] == plain
+    assert set(body["timings"]) == {"total_ms", "stages_ms", "spans"}
+    assert "analyze" in body["timings"]["stages_ms"]
+    assert all(set(span) == {"stage", "start_ms", "duration_ms"} for span in body["timings"]["spans"])
+    assert "Server-Timing" in response.headers and "ETag" in response.headers
+
+    # Non-JSON responses are left alone
+    assert client.get("/metrics?debug=1").text.startswith("# HELP")
+
+def test_histogram_and_timings_render(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    histogram = Histogram("test_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage="a")
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="a",le="0.1"} 1',
+        'test_seconds_bucket{stage="a",le="1.0"} 2',
+        'test_seconds_bucket{stage="a",le="+Inf"} 3',
+        'test_seconds_sum{stage="a"} 5.55',
+        'test_seconds_count{stage="a"} 3',
+    ]
+    assert render_metrics() == histogram.render() + "\n"
+
+    timings = Timings()
+    timings.add("fetch", timings.started, 0.25)
+    timings.add("fetch", timings.started + 0.1, 0.25)
+    assert timings.server_timing(1.0) == "fetch;dur=500.0, total;dur=1000.0"
@@ -0,0 +1,79 @@
+import glob
+import os
+
+import pytest
+
+from backend import scraper
+from backend.parsers import LXML_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not LXML_AVAILABLE, reason="lxml is not installed")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = sorted(os.path.basename(path) for path in glob.glob(os.path.join(ROOT, "debug_*.html")))
+
+LEAGUE_URL = "https://fantasy.nfl.com/league/1"
+
+def score_strip(*scores):
+    """
+    A week page whose score strip holds one matchup per pair of scores.
+    """
+    items = []
+    for i, (score1, score2) in enumerate(scores):
+        items.append(
+            f'<li><a title="Team {2 * i + 1} vs. Team {2 * i + 2}">'
+            f'<div class="first"><em>Team {2 * i + 1}</em> <span class="teamTotal teamId-{2 * i + 1}">{score1}</span></div>'
+            f'<div class="last"><em>Team {2 * i + 2}</em> <span class="teamTotal teamId-{2 * i + 2}">{score2}</span></div>'
+            f'</a></li>'
+        )
+    return f'<html><body><ul class="ss">{"".join(items)}</ul></body></html>'.encode()
+
+PAGES = {
+    "scores": score_strip(("101.5", "99.2"), ("1,234.56", "0.00"), ("-", ""), (" 87.1 ", "n/a")),
+    "no_link": b'<html><body><ul class="ss"><li>Bye</li><li><a title="no match">x</a></li></ul></body></html>',
+    "access_error": b'<html><body>League Not Found<div class="error-message"> League Not Found </div></body></html>',
+    "private": b'<html><body><h1 class="leagueName">Private League</h1></body></html>',
+}
+
+def parse(monkeypatch, backend, fn, *args):
+    """
+    Result of `fn` with the given parser backend, or the message it raised.
+    """
+    monkeypatch.setattr(scraper, "PARSER_BACKEND", backend)
+    try:
+        return fn(*args)
+    except Exception as e:
+        return f"raised: {e}"
+
+def read(name):
+    if name in PAGES:
+        return PAGES[name]
+    with open(os.path.join(ROOT, name), "rb") as f:
+        return f.read()
+
+@pytest.mark.parametrize("name", FIXTURES + list(PAGES))
+@pytest.mark.parametrize("url", [LEAGUE_URL, "https://id.nfl.com/signin?redirect=league"])
+def test_league_page_matches_bs4(monkeypatch, name, url):
+    content = read(name)
+    expected = parse(monkeypatch, "bs4", scraper.parse_league_page, content, "1", url)
+    assert parse(monkeypatch, "lxml", scraper.parse_league_page, content, "1", url) == expected
+
+@pytest.mark.parametrize("name", FIXTURES + list(PAGES))
+def test_schedule_page_matches_bs4(monkeypatch, name):
+    content = read(name)
+    expected = parse(monkeypatch, "bs4", scraper.parse_schedule_page, content, 13)
+    assert parse(monkeypatch, "lxml", scraper.parse_schedule_page, content, 13) == expected
+
+def test_fixtures_cover_standings_and_scores(monkeypatch):
+    league = parse(monkeypatch, "lxml", scraper.parse_league_page, read("debug_league.html"), "1", LEAGUE_URL)
+    assert league["teams"] and any(team["logo_url"] for team in league["teams"])
+    assert any(parse(monkeypatch, "lxml", scraper.parse_schedule_page, read(name), 13) for name in FIXTURES)
+
+def test_score_edge_cases(monkeypatch):
+    schedule = parse(monkeypatch, "lxml", scraper.parse_schedule_page, PAGES["scores"], 13)
+    scores = [(game["team1_score"], game["team2_score"]) for game in schedule]
+    assert scores == [(101.5, 99.2), (1234.56, 0.0), (None, None), (87.1, None)]
+
+def test_access_error_is_raised(monkeypatch):
+    assert parse(monkeypatch, "lxml", scraper.parse_league_page, PAGES["access_error"], "1", LEAGUE_URL) == (
+        "raised: League access error: League Not Found"
+    )
@@ -0,0 +1,160 @@
+import asyncio
+import types
+
+import pytest
+
+from backend import refresh
+from backend.refresh import LeagueRefresher
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(refresh, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+class Loader:
+    """
+    Fake league loader: returns the league id and a load counter, and
+    waits for `gate` when one is set.
+    """
+
+    def __init__(self):
+        self.loads = 0
+        self.gate = None
+        self.fail = False
+
+    async def __call__(self, league_id):
+        self.loads += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise ValueError(f"League {league_id} not found")
+        return {"league_id": league_id, "version": self.loads}
+
+async def settle(refresher, league_id):
+    """
+    Lets a background refresh of `league_id` start and run to completion.
+    """
+    await asyncio.sleep(0.01)
+    while league_id in refresher._flights:
+        await asyncio.sleep(0.01)
+
+def test_stale_data_is_served_while_refreshing(clock):
+    async def scenario():
+        loader = Loader()
+        warmed = []
+
+        async def warm(league_id, data):
+            # The old data is still served while the new one warms up
+            warmed.append((data["version"], (await refresher.get(league_id))[0]["version"]))
+
+        refresher = LeagueRefresher(loader, warm, refresh_interval=60, idle_timeout=600)
+        assert await refresher.get("1") == ({"league_id": "1", "version": 1}, 0)
+
+        clock.now += 30
+        assert await refresher.get("1") == ({"league_id": "1", "version": 1}, 30)
+        assert loader.loads == 1
+
+        clock.now += 30
+        loader.gate = asyncio.Event()
+        data, age = await refresher.get("1")
+        assert (data["version"], age) == (1, 60)
+        await asyncio.sleep(0.01)
+        assert loader.loads == 2
+        # Requests during the refresh don't start another one
+        assert (await refresher.get("1"))[0]["version"] == 1
+
+        loader.gate.set()
+        await settle(refresher, "1")
+        assert warmed == [(2, 1)]
+        assert await refresher.get("1") == ({"league_id": "1", "version": 2}, 0)
+        assert loader.loads == 2
+
+    asyncio.run(scenario())
+
+def test_failed_refresh_keeps_last_good_data(clock):
+    async def scenario():
+        loader = Loader()
+        refresher = LeagueRefresher(loader, refresh_interval=60, idle_timeout=600)
+        await refresher.get("1")
+
+        loader.fail = True
+        clock.now += 60
+        await refresher.get("1")
+        await settle(refresher, "1")
+        assert await refresher.get("1") == ({"league_id": "1", "version": 1}, 60)
+        # The next attempt waits a full interval
+        assert loader.loads == 2
+        clock.now += 60
+        await refresher.get("1")
+        await settle(refresher, "1")
+        assert loader.loads == 3
+
+    asyncio.run(scenario())
+
+def test_failed_first_load_raises(clock):
+    async def scenario():
+        loader = Loader()
+        loader.fail = True
+        refresher = LeagueRefresher(loader)
+        with pytest.raises(ValueError, match="League 1 not found"):
+            await refresher.get("1")
+        assert "1" not in refresher
+
+        loader.fail = False
+        assert (await refresher.get("1"))[0]["version"] == 2
+
+    asyncio.run(scenario())
+
+def test_idle_leagues_are_dropped(clock):
+    async def scenario():
+        loader = Loader()
+        refresher = LeagueRefresher(loader, refresh_interval=60, idle_timeout=600)
+        await refresher.get("1")
+        await refresher.get("2")
+
+        clock.now += 300
+        await refresher.get("2")
+        await settle(refresher, "2")
+        clock.now += 301
+        refresher.sweep()
+        assert "1" not in refresher and "2" in refresher
+        # Still requested, so the sweep refreshed it
+        await settle(refresher, "2")
+        assert loader.loads == 4
+
+    asyncio.run(scenario())
+
+def test_background_refresh_does_not_revive_a_dropped_league(clock):
+    async def scenario():
+        loader = Loader()
+        refresher = LeagueRefresher(loader, refresh_interval=60, idle_timeout=600)
+        await refresher.get("1")
+        clock.now += 60
+        loader.gate = asyncio.Event()
+        await refresher.get("1")
+
+        clock.now += 601
+        refresher.sweep()
+        loader.gate.set()
+        await settle(refresher, "1")
+        assert "1" not in refresher
+
+    asyncio.run(scenario())
+
+def test_league_count_is_bounded(clock):
+    async def scenario():
+        refresher = LeagueRefresher(Loader(), max_leagues=2)
+        for league_id in "123":
+            await refresher.get(league_id)
+            clock.now += 1
+        assert len(refresher) == 2
+        # League 1 was requested least recently
+        assert "1" not in refresher
+
+        await refresher.get("2")
+        clock.now += 1
+        await refresher.get("4")
+        assert len(refresher) == 2 and "3" not in refresher and "2" in refresher
+
+    asyncio.run(scenario())
@@ -0,0 +1,45 @@
+import copy
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from backend.responses import cached_json, state_etag
+from benchmarks.leagues import synthetic_league
+
+LEAGUE = synthetic_league(8, 2, seed=0)
+
+def make_client(league):
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=100)
+
+    @app.get("/league")
+    def get_league(request: Request):
+        return cached_json(request, league, "no-cache")
+
+    @app.get("/etag")
+    def get_etag(request: Request):
+        return {"etag": state_etag(request, league)}
+
+    return TestClient(app)
+
+def test_body_etag_is_weak_and_shared_across_encodings():
+    client = make_client(LEAGUE)
+    gzipped = client.get("/league", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/league", headers={"Accept-Encoding": "identity"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["ETag"].startswith('W/"')
+    assert gzipped.headers["ETag"] == identity.headers["ETag"]
+
+    revalidated = client.get("/league", headers={"If-None-Match": identity.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+def test_state_etag_covers_display_fields():
+    renamed = copy.deepcopy(LEAGUE)
+    renamed["teams"][0]["name"] = "Renamed"
+    etag = make_client(LEAGUE).get("/etag").json()["etag"]
+
+    assert make_client(copy.deepcopy(LEAGUE)).get("/etag?debug=1").json()["etag"] == etag
+    assert make_client(renamed).get("/etag").json()["etag"] != etag
+    assert make_client(LEAGUE).get("/etag?simulations=100").json()["etag"] != etag
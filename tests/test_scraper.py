@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from backend import fetch, scraper
+from backend.page_cache import MemoryPageCache
+from backend.scraper import refresh_league, weeks_to_refresh
+from backend.store import SnapshotStore
+
+from .http_stub import StubSession
+
+TOTAL_WEEKS = 14
+
+def week_url(week):
+    return f"{scraper.BASE_URL}/1?week={week}"
+
+def week_page(week, scored):
+    """
+    A week's matchups, as the stubbed parse_schedule_page reads them back.
+    """
+    score = 100.0 + week if scored else None
+    return json.dumps([{"week": week, "team1_id": "1", "team2_id": "2", "team1_score": score, "team2_score": 90.0 if scored else None, "completed": scored}]).encode()
+
+def header(current_week):
+    return {
+        "league_id": "1",
+        "name": "League 1",
+        "teams": [{"id": "1", "name": "Team 1"}, {"id": "2", "name": "Team 2"}],
+        "schedule": [],
+        "current_week": current_week,
+        "total_weeks": TOTAL_WEEKS,
+        "playoff_spots": 1,
+    }
+
+@pytest.fixture
+def session(monkeypatch):
+    session = StubSession({week_url(week): week_page(week, scored=week < 12) for week in range(1, TOTAL_WEEKS + 1)})
+    monkeypatch.setattr(fetch, "_session", session)
+    monkeypatch.setattr(fetch, "_page_cache", MemoryPageCache())
+    monkeypatch.setattr(scraper, "parse_schedule_page", lambda content, week: json.loads(content))
+    return session
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(str(tmp_path / "leagues.db"))
+    yield store
+    store.close()
+
+def test_weeks_to_refresh():
+    assert weeks_to_refresh({}, 3, 5) == [1, 2, 3, 4, 5]
+    assert weeks_to_refresh({1: True, 2: True, 3: False, 4: False, 5: False}, 3, 5) == [3]
+    # Week 3 rolled over: fetched once more for its final scores
+    assert weeks_to_refresh({1: True, 2: True, 3: False, 4: False, 5: False}, 4, 5) == [3, 4]
+
+def test_cold_start_fetches_every_week(session, store):
+    league = refresh_league(store, header(12))
+    assert sorted(session.urls()) == sorted(week_url(week) for week in range(1, TOTAL_WEEKS + 1))
+    assert store.stored_weeks("1") == {week: week < 12 for week in range(1, TOTAL_WEEKS + 1)}
+    assert [g["week"] for g in league["schedule"]] == list(range(1, TOTAL_WEEKS + 1))
+    assert league["teams"] == header(12)["teams"]
+
+def test_week_rollover_stores_final_scores(session, store):
+    refresh_league(store, header(12))
+    # Week 12 is scored and the league moves on while the page cache still
+    # holds week 12 as a fresh current-week page
+    session.pages[week_url(12)] = week_page(12, scored=True)
+    session.requests.clear()
+
+    league = refresh_league(store, header(13))
+    # Week 13 is still fresh in the page cache
+    assert session.urls() == [week_url(12)]
+    week12 = next(g for g in league["schedule"] if g["week"] == 12)
+    assert week12["completed"] and week12["team1_score"] == 112.0
+    assert store.stored_weeks("1")[12] is True
+
+def test_completed_weeks_are_never_refetched(session, store, monkeypatch):
+    # Without a page cache every page refresh_league asks for hits the network
+    monkeypatch.setattr(fetch, "_page_cache", None)
+    refresh_league(store, header(12))
+    refresh_league(store, header(13))
+    session.requests.clear()
+
+    refresh_league(store, header(13))
+    refresh_league(store, header(14))
+    assert sorted(session.urls()) == [week_url(13), week_url(13), week_url(14)]
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from backend.calculator import calculate_odds
+from backend.plan import get_plan
+from backend.simulation import (
+    EXACT_MAX_GAMES,
+    build_game_arrays,
+    final_wins,
+    make_rng,
+    open_spots,
+    rank_standings,
+    rank_teams,
+    side_arrays,
+    simulate_league,
+    simulate_outcomes,
+)
+from benchmarks.leagues import synthetic_league
+
+from .brute_force import enumerate_league
+
+LEAGUES = [(6, 1), (6, 2), (6, 4), (8, 1), (8, 2), (10, 1)]
+
+@pytest.mark.parametrize("teams,weeks", LEAGUES)
+@pytest.mark.parametrize("seed", range(3))
+def test_enumeration_matches_brute_force(teams, weeks, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    expected = enumerate_league(league)
+
+    arrays = build_game_arrays(league["teams"], league["schedule"])
+    sim = simulate_league(arrays, league["playoff_spots"], 1000, exact_max_games=EXACT_MAX_GAMES)
+    assert sim["exact"]
+    probabilities = sim["weights"] @ sim["made"]
+    for i, tid in enumerate(arrays["team_ids"]):
+        assert probabilities[i] == pytest.approx(expected[tid]["playoff"], abs=1e-12)
+
+@pytest.mark.parametrize("teams,weeks", LEAGUES)
+@pytest.mark.parametrize("seed", range(3))
+def test_exact_odds_match_brute_force(teams, weeks, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    expected = enumerate_league(league)
+
+    for entry in calculate_odds(league):
+        tid = entry["team_id"]
+        assert entry["margin_of_error"] == entry["seed_margin_of_error"] == 0.0
+        assert entry["playoff_probability"] == pytest.approx(round(expected[tid]["playoff"] * 100, 1), abs=0.1)
+        assert entry["clinched_playoffs"] == expected[tid]["always"]
+        assert entry["eliminated"] == expected[tid]["never"]
+
+def test_sampling_agrees_with_enumeration():
+    league = synthetic_league(8, 2, seed=1)
+    arrays = build_game_arrays(league["teams"], league["schedule"])
+    exact = simulate_league(arrays, league["playoff_spots"], 1000)
+    sampled = simulate_league(arrays, league["playoff_spots"], 200000, seed=1, exact_max_games=0)
+    assert not sampled["exact"]
+    np.testing.assert_allclose(sampled["weights"] @ sampled["made"], exact["weights"] @ exact["made"], atol=0.01)
+
+@pytest.mark.parametrize("teams,weeks", [(8, 2), (12, 4), (16, 3), (32, 6)])
+@pytest.mark.parametrize("seed", range(2))
+def test_rank_standings_matches_rank_teams(teams, weeks, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    arrays = get_plan(league).arrays
+    rng = make_rng(seed)
+    wins = final_wins(arrays, simulate_outcomes(arrays, 2000, rng))
+    side_outcomes = simulate_outcomes(side_arrays(arrays), 2000, rng)
+    for playoff_spots in range(teams + 1):
+        top_k = open_spots(arrays, playoff_spots)
+        expected = rank_teams(arrays, wins, top_k)["top"]
+        np.testing.assert_array_equal(rank_standings(arrays, wins, top_k, side_outcomes)["top"], expected)
+
+@pytest.mark.parametrize("teams,weeks", LEAGUES)
+@pytest.mark.parametrize("seed", range(3))
+def test_seeds_match_brute_force(teams, weeks, seed):
+    league = synthetic_league(teams, weeks, seed=seed)
+    expected = enumerate_league(league)
+    arrays = get_plan(league).arrays
+
+    exact = simulate_league(arrays, league["playoff_spots"], 1000, positions=True)
+    sampled = simulate_league(arrays, league["playoff_spots"], 100000, seed=seed, exact_max_games=0, positions=True)
+    for i, tid in enumerate(arrays["team_ids"]):
+        np.testing.assert_allclose(exact["seeds"][i], expected[tid]["seeds"], atol=1e-12)
+        np.testing.assert_allclose(sampled["seeds"][i], expected[tid]["seeds"], atol=0.01)
+
+def test_sampled_side_games_keep_seeds_unbiased():
+    # Two clinched teams with equal Points For meet in a side game, on top
+    # of 16 open games: too many rows to cross with every side result
+    league = synthetic_league(8, 4, seed=0)
+    for team in league["teams"]:
+        team["wins"] = 5
+    week = league["current_week"]
+    for tid in ("A", "B"):
+        league["teams"].append({**league["teams"][0], "id": tid, "name": f"Team {tid}", "wins": 20, "points_for": 1500.0})
+    league["schedule"].append({"week": week, "team1_id": "A", "team2_id": "B", "completed": False})
+    league["playoff_spots"] = 4
+    expected = enumerate_league(league)
+    arrays = get_plan(league).arrays
+    assert (len(arrays["t1_prob"]), len(arrays["side_t1_prob"])) == (16, 1)
+
+    sim = simulate_league(arrays, league["playoff_spots"], 1000, seed=0, exact_max_games=16, positions=True)
+    assert sim["exact"]
+    assert sim["seed_half_width"] > 0
+    for i, tid in enumerate(arrays["team_ids"]):
+        np.testing.assert_allclose(sim["seeds"][i], expected[tid]["seeds"], atol=sim["seed_half_width"])
+    first = {tid: sim["seeds"][i, 0] for i, tid in enumerate(arrays["team_ids"])}
+    assert first["A"] == pytest.approx(0.5, abs=sim["seed_half_width"])
+    assert first["B"] == pytest.approx(0.5, abs=sim["seed_half_width"])
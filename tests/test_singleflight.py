@@ -0,0 +1,61 @@
+import asyncio
+
+from backend.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_run():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return f"result {key}"
+
+        results = await asyncio.gather(*(flights.do(key, lambda key=key: work(key)) for key in "aab"))
+        assert results == ["result a", "result a", "result b"]
+        assert sorted(calls) == ["a", "b"]
+        # Released once finished, so the next call starts fresh
+        assert len(flights) == 0
+        assert await flights.do("a", lambda: work("a")) == "result a"
+        assert calls.count("a") == 2
+
+    asyncio.run(scenario())
+
+def test_cancelled_caller_leaves_run_going():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def work():
+            started.set()
+            await release.wait()
+            return "done"
+
+        leaver = asyncio.ensure_future(flights.do("a", work))
+        follower = asyncio.ensure_future(flights.do("a", work))
+        await started.wait()
+        leaver.cancel()
+        await asyncio.sleep(0)
+        assert "a" in flights
+
+        release.set()
+        assert await follower == "done"
+        assert leaver.cancelled()
+
+    asyncio.run(scenario())
+
+def test_failure_reaches_every_caller():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flights.do("a", work), flights.do("a", work), return_exceptions=True)
+        assert [str(r) for r in results] == ["boom", "boom"]
+        assert "a" not in flights
+
+    asyncio.run(scenario())
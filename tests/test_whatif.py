@@ -0,0 +1,73 @@
+import pytest
+
+from backend import calculator
+from backend.calculator import whatif_odds
+from backend.plan import get_plan
+from benchmarks.leagues import synthetic_league
+
+from .brute_force import enumerate_league
+
+def first_lock(league):
+    """
+    Locks the first simulated game for its team 1.
+    """
+    game_key = get_plan(league).arrays["game_keys"][0]
+    return {game_key: game_key.split("-")[1]}
+
+def playoff_odds(result):
+    return {entry["team_id"]: entry["playoff_probability"] for entry in result["odds"]}
+
+@pytest.mark.parametrize("seed", range(3))
+def test_exact_whatif_matches_brute_force(seed):
+    league = synthetic_league(8, 3, seed=seed)
+    locks = first_lock(league)
+    expected = enumerate_league(league, locks)
+
+    result = whatif_odds(league, locks)
+    assert result["method"] == "conditioned"
+    for tid, probability in playoff_odds(result).items():
+        assert probability == pytest.approx(expected[tid]["playoff"] * 100, abs=0.051)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conditioned_and_topped_up_agree(seed, monkeypatch):
+    league = synthetic_league(8, 3, seed=seed)
+    locks = first_lock(league)
+    expected = enumerate_league(league, locks)
+    settings = dict(simulations=100000, seed=seed, exact_max_games=0, target_width=None)
+
+    monkeypatch.setattr(calculator, "MIN_CONDITIONED_ROWS", 0)
+    conditioned = whatif_odds(league, locks, **settings)
+    monkeypatch.setattr(calculator, "MIN_CONDITIONED_ROWS", 2 * conditioned["simulations"])
+    topped_up = whatif_odds(league, locks, **settings)
+
+    assert conditioned["method"] == "conditioned"
+    assert conditioned["conditioned_rows"] == conditioned["simulations"]
+    assert topped_up["method"] == "topped_up"
+    assert topped_up["conditioned_rows"] == conditioned["simulations"]
+    assert topped_up["simulations"] == 2 * conditioned["simulations"]
+    conditioned_odds = playoff_odds(conditioned)
+    topped_up_odds = playoff_odds(topped_up)
+    for tid, entry in expected.items():
+        assert conditioned_odds[tid] == pytest.approx(topped_up_odds[tid], abs=1.5)
+        assert conditioned_odds[tid] == pytest.approx(entry["playoff"] * 100, abs=1.5)
+        assert topped_up_odds[tid] == pytest.approx(entry["playoff"] * 100, abs=1.5)
+
+def test_rare_locks_are_topped_up_from_the_cached_run(monkeypatch):
+    league = synthetic_league(8, 3, seed=0)
+    locks = first_lock(league)
+    settings = dict(simulations=20000, seed=0, exact_max_games=0, target_width=None)
+    monkeypatch.setattr(calculator, "MIN_CONDITIONED_ROWS", 20000)
+    simulate_league = calculator.simulate_league
+    draws = []
+
+    def counting_simulate_league(arrays, playoff_spots, simulations, *args, **kwargs):
+        draws.append(simulations)
+        return simulate_league(arrays, playoff_spots, simulations, *args, **kwargs)
+
+    monkeypatch.setattr(calculator, "simulate_league", counting_simulate_league)
+
+    result = whatif_odds(league, locks, **settings)
+    assert result["method"] == "topped_up"
+    assert 0 < result["conditioned_rows"] < 20000
+    # Only the shortfall is simulated
+    assert draws == [20000 - result["conditioned_rows"]]